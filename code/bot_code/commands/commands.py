@@ -45,6 +45,12 @@ class TomibotchiCommands(commands.Cog):
         """Log when commands are ready"""
         print("DEBUG: TomibotchiCommands Cog is ready!")
         print("DEBUG: Available commands:", [command.name for command in self.get_cog_commands()])
+
+        # Preload all active pets in one query instead of one query per first access
+        query = "SELECT pet_id FROM pets WHERE active = TRUE"
+        result = await self.bot.loop.run_in_executor(None, execute_query, query)
+        if result:
+            await self.state_manager.warmup([pet_id for pet_id, in result])
         print("Bot has completed boot up sequence.")
     
     def get_cog_commands(self):
@@ -4,18 +4,18 @@ from game.state import PetStatus
 # Mapping of species -> state -> emotion -> URL
 PET_SPRITES: Dict[str, Dict[str, Dict[str, str]]] = {
     "cat": {
-        PetStatus.NORMAL.value: {
+        PetStatus.NORMAL.name.lower(): {
             "happy": "https://i.imgur.com/ZdCkGIO.gif",
             "neutral": "https://i.imgur.com/ZdCkGIO.gif",
             "sad": "https://i.imgur.com/ZdCkGIO.gif"
         },
-        PetStatus.SLEEPING.value: {
+        PetStatus.SLEEPING.name.lower(): {
             "neutral": "https://i.imgur.com/ZdCkGIO.gif"
         },
-        PetStatus.SICK.value: {
+        PetStatus.SICK.name.lower(): {
             "neutral": "https://i.imgur.com/ZdCkGIO.gif"
         },
-        PetStatus.UNHAPPY.value: {
+        PetStatus.UNHAPPY.name.lower(): {
             "neutral": "https://i.imgur.com/ZdCkGIO.gif"
         }
     }
@@ -1,9 +1,10 @@
 import mysql.connector
 from mysql.connector.pooling import MySQLConnectionPool
 from typing import Optional, Union, List, Dict, Any, Tuple
+import json
 import traceback
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 
 from utils.utils import config, logger, lock
 
@@ -291,6 +292,31 @@ def create_pet(user_id: int, guild_id: int, name: str, species: str) -> Optional
         return None
 
 
+def _pet_stats_from_row(
+    name: str,
+    species: str,
+    happiness: Optional[int],
+    hunger: Optional[int],
+    energy: Optional[int],
+    hygiene: Optional[int],
+    last_update: Optional[datetime]
+) -> Dict[str, Any]:
+    """Builds the pet stats dictionary from a pets/pet_stats row."""
+    # Ensure all stats are within valid range
+    stats = {
+        'happiness': max(0, min(100, happiness or 100)),
+        'hunger': max(0, min(100, hunger or 100)),
+        'energy': max(0, min(100, energy or 100)),
+        'hygiene': max(0, min(100, hygiene or 100))
+    }
+    
+    return {
+        'name': name,
+        'species': species,
+        'stats': stats,
+        'last_update': last_update or datetime.now(timezone.utc)
+    }
+
 def get_pet_stats(pet_id: int) -> Optional[Dict[str, Any]]:
     """Gets current stats for a pet."""
     try:
@@ -307,28 +333,47 @@ def get_pet_stats(pet_id: int) -> Optional[Dict[str, Any]]:
             logger.error(f"No stats found for pet {pet_id}")
             return None
             
-        name, species, happiness, hunger, energy, hygiene, last_update = result[0]
-        
-        # Ensure all stats are within valid range
-        stats = {
-            'happiness': max(0, min(100, happiness or 100)),
-            'hunger': max(0, min(100, hunger or 100)),
-            'energy': max(0, min(100, energy or 100)),
-            'hygiene': max(0, min(100, hygiene or 100))
-        }
-        
-        return {
-            'name': name,
-            'species': species,
-            'stats': stats,
-            'last_update': last_update or datetime.now(timezone.utc)
-        }
+        return _pet_stats_from_row(*result[0])
         
     except Exception as e:
         logger.error(f"Error getting pet stats: {e}")
         logger.error(traceback.format_exc())
         return None
 
+def get_pet_stats_many(pet_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Gets current stats for several pets in a single query.
+    
+    Args:
+        pet_ids: Pet IDs to load
+        
+    Returns:
+        Dict mapping pet ID to the same structure get_pet_stats returns.
+        Missing or inactive pets are left out.
+    """
+    if not pet_ids:
+        return {}
+        
+    try:
+        placeholders = ', '.join(['%s'] * len(pet_ids))
+        query = f"""
+            SELECT p.pet_id, p.name, p.species, ps.happiness, ps.hunger, 
+                   ps.energy, ps.hygiene, ps.last_update
+            FROM pets p
+            JOIN pet_stats ps ON p.pet_id = ps.pet_id
+            WHERE p.pet_id IN ({placeholders}) AND p.active = TRUE
+        """
+        result = execute_query(query, tuple(pet_ids))
+        if not result:
+            return {}
+            
+        return {row[0]: _pet_stats_from_row(*row[1:]) for row in result}
+        
+    except Exception as e:
+        logger.error(f"Error getting stats for pets {pet_ids}: {e}")
+        logger.error(traceback.format_exc())
+        return {}
+
 def update_pet_stats(
     pet_id: int,
     stats: Dict[str, int],
@@ -377,7 +422,7 @@ def update_pet_stats(
                 interaction_params = (
                     pet_id,
                     interaction_type,
-                    str(stats),
+                    json.dumps(stats),
                     pet_id
                 )
                 execute_query(interaction_query, interaction_params, commit=True)
@@ -389,6 +434,92 @@ def update_pet_stats(
         logger.error(traceback.format_exc())
         return False
 
+def update_pet_stats_many(items: List[Tuple[int, Dict[str, int]]]) -> bool:
+    """
+    Updates stats for several pets in a single multi-row upsert.
+    
+    Args:
+        items: List of (pet_id, stats) pairs to persist
+        
+    Returns:
+        bool: True if successful
+    """
+    if not items:
+        return True
+        
+    try:
+        with lock:
+            # One statement for the whole batch; executemany would still send
+            # one UPDATE per pet
+            rows = ', '.join(['(%s, %s, %s, %s, %s, UTC_TIMESTAMP())'] * len(items))
+            query = f"""
+                INSERT INTO pet_stats
+                (pet_id, happiness, hunger, energy, hygiene, last_update)
+                VALUES {rows}
+                ON DUPLICATE KEY UPDATE
+                    happiness = VALUES(happiness),
+                    hunger = VALUES(hunger),
+                    energy = VALUES(energy),
+                    hygiene = VALUES(hygiene),
+                    last_update = VALUES(last_update)
+            """
+            params = []
+            for pet_id, stats in items:
+                params.extend((
+                    pet_id,
+                    stats['happiness'],
+                    stats['hunger'],
+                    stats['energy'],
+                    stats['hygiene']
+                ))
+            execute_query(query, tuple(params), commit=True)
+            return True
+            
+    except Exception as e:
+        logger.error(f"Error updating stats for {len(items)} pets: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+def log_interactions_many(rows: List[Tuple[int, str, str]]) -> bool:
+    """
+    Records several pet interactions in a single batched statement.
+    
+    Args:
+        rows: List of (pet_id, interaction_type, stat_changes) tuples
+        
+    Returns:
+        bool: True if successful
+    """
+    if not rows:
+        return True
+        
+    try:
+        with lock:
+            # One statement for the whole batch; executemany would still send one
+            # INSERT ... SELECT per row. Rows for unknown pets drop out of the join,
+            # as they did with the per-row WHERE.
+            batch = ' UNION ALL '.join(
+                ['SELECT %s AS pet_id, %s AS interaction_type, %s AS stat_changes']
+                + ['SELECT %s, %s, %s'] * (len(rows) - 1)
+            )
+            query = f"""
+                INSERT INTO interaction_history
+                (pet_id, user_id, interaction_type, stat_changes)
+                SELECT b.pet_id, p.user_id, b.interaction_type, b.stat_changes
+                FROM ({batch}) AS b
+                JOIN pets p ON p.pet_id = b.pet_id
+            """
+            params = []
+            for row in rows:
+                params.extend(row)
+            execute_query(query, tuple(params), commit=True)
+            return True
+            
+    except Exception as e:
+        logger.error(f"Error logging {len(rows)} interactions: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
 # Initialize pools and tables on module load
 if setup_pool():
     logger.info('Connection pools set up successfully')
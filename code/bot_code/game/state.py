@@ -1,39 +1,54 @@
 from __future__ import annotations
 import asyncio
+import itertools
+import json
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 import logging
+import sys
+import time
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 import traceback
-from contextlib import asynccontextmanager
 
-from database.database import get_pet_stats, update_pet_stats
+from database.database import (
+    get_pet_stats_many,
+    log_interactions_many,
+    update_pet_stats,
+    update_pet_stats_many
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Change the Enum class name from PetState to PetStatus
-class PetStatus(Enum):
-    NORMAL = "normal"
-    SLEEPING = "sleeping"
-    SICK = "sick"
-    UNHAPPY = "unhappy"
+# IntEnum so comparisons/hashing stay in C and members can index tuples directly.
+# Use .name (e.g. status.name.lower()) wherever a string is needed.
+class PetStatus(IntEnum):
+    NORMAL = 0
+    SLEEPING = 1
+    SICK = 2
+    UNHAPPY = 3
 
-class InteractionType(Enum):
-    FEED = "feed"
-    CLEAN = "clean"
-    SLEEP = "sleep"
-    WAKE = "wake"
-    PLAY = "play"
-    PET = "pet"
-    EXERCISE = "exercise"
-    TREAT = "treat"
-    MEDICINE = "medicine"
+class InteractionType(IntEnum):
+    FEED = 0
+    CLEAN = 1
+    SLEEP = 2
+    WAKE = 3
+    PLAY = 4
+    PET = 5
+    EXERCISE = 6
+    TREAT = 7
+    MEDICINE = 8
 
-@dataclass
+# Slot indices into PetState._stats
+HUNGER, ENERGY, HYGIENE, HAPPINESS = range(4)
+
+@dataclass(frozen=True)
 class InteractionEffect:
-    """Defines the effects and requirements of a pet interaction."""
+    """Defines the effects and requirements of a pet interaction. One shared instance per InteractionType."""
+    __slots__ = ('happiness', 'hunger', 'energy', 'hygiene', 'cooldown', 'conditions')
+    
     happiness: int
     hunger: int
     energy: int
@@ -90,1531 +105,506 @@ INTERACTION_EFFECTS = {
     )
 }
 
+# Condition checks as (key, failing test for the condition's value, message shown
+# to the user), in the order interactions have always validated them: sleep status
+# first, then stats, the treat limit and sickness. The first failing check wins.
+_CONDITION_CHECKS = (
+    ("not_sleeping", lambda value: lambda pet: pet._state is PetStatus.SLEEPING,
+        "Pet is sleeping"),
+    ("is_sleeping", lambda value: lambda pet: pet._state is not PetStatus.SLEEPING,
+        "Pet must be sleeping for this interaction"),
+    ("max_hunger", lambda value: lambda pet: pet._stats[HUNGER] >= value,
+        "Pet isn't hungry right now"),
+    ("min_energy", lambda value: lambda pet: pet._stats[ENERGY] < value,
+        "Pet is too tired"),
+    ("max_energy", lambda value: lambda pet: pet._stats[ENERGY] >= value,
+        "Pet isn't tired enough to sleep"),
+    ("max_treats_per_day", lambda value: lambda pet: pet.treat_count >= value,
+        "Daily treat limit reached"),
+    ("is_sick", lambda value: lambda pet: pet._state is not PetStatus.SICK,
+        "Pet must be sick to use medicine"),
+)
+_CONDITION_KEYS = frozenset(key for key, _, _ in _CONDITION_CHECKS)
+
+def _make_checker(conditions: Dict[str, Any]) -> Callable[[PetState], Optional[str]]:
+    """
+    Builds a checker that runs only the tests one interaction's conditions need.
+    
+    Args:
+        conditions: Conditions dict from an InteractionEffect
+        
+    Returns:
+        Function taking a PetState and returning None if allowed, else a failure message
+    """
+    unknown = conditions.keys() - _CONDITION_KEYS
+    if unknown:
+        raise ValueError(f"Unknown interaction condition: {', '.join(sorted(unknown))}")
+        
+    tests = tuple(
+        (make_test(conditions[key]), message)
+        for key, make_test, message in _CONDITION_CHECKS
+        if key in conditions and conditions[key] is not False
+    )
+    
+    def check(pet: PetState) -> Optional[str]:
+        for test, message in tests:
+            if test(pet):
+                return message
+        return None
+    return check
+
+# Indexed directly by InteractionType (an IntEnum), so lookups skip dict hashing
+INTERACTION_EFFECTS_TABLE = tuple(INTERACTION_EFFECTS[t] for t in InteractionType)
+INTERACTION_CHECKERS = tuple(_make_checker(effect.conditions) for effect in INTERACTION_EFFECTS_TABLE)
+INTERACTION_COOLDOWNS = tuple(effect.cooldown.total_seconds() for effect in INTERACTION_EFFECTS_TABLE)
+
+# Status by (hygiene < 30) * 2 + (happiness < 30), see PetState._status_for
+_STATUS_LUT = (PetStatus.NORMAL, PetStatus.UNHAPPY, PetStatus.SICK, PetStatus.SICK)
+
 class AtomicCounter:
-    """Thread-safe counter for tracking atomic operations."""
+    """Counter for tracking operations; itertools.count increments atomically under the GIL."""
+    __slots__ = ('_counter', '_value')
+    
     def __init__(self):
+        self._counter = itertools.count(1)
         self._value = 0
-        self._lock = asyncio.Lock()
     
-    async def increment(self) -> int:
-        async with self._lock:
-            self._value += 1
-            return self._value
+    def increment(self) -> int:
+        self._value = next(self._counter)
+        return self._value
     
-    async def get_value(self) -> int:
-        async with self._lock:
-            return self._value
-            
+    def get_value(self) -> int:
+        return self._value
+
 class PetState:
-    def __init__(self, pet_id: int, name: str, species: str, stats: Dict[str, int]):
-        """Initialize pet state."""
+    __slots__ = (
+        'pet_id', 'name', 'species', '_stats', '_state', '_base_time', 'last_update',
+        'interaction_history', 'treat_count', 'last_treat_reset', '_lock_obj', '_on_change'
+    )
+    
+    # Hourly decay per stat, in _stats slot order. Stats are stored as of _base_time
+    # and decayed on read, so idle pets need no periodic ticking; tick() only folds
+    # elapsed whole hours back into the stored values.
+    _DECAY = (5, 3, 4, 2)
+    
+    def __init__(
+        self,
+        pet_id: int,
+        name: str,
+        species: str,
+        stats: Dict[str, int],
+        on_change: Optional[Callable[[int, str, Dict[str, int]], None]] = None
+    ):
+        """
+        Initialize pet state.
+        
+        Args:
+            on_change: Called with (pet_id, interaction_type, stats) after a successful
+                interaction to buffer the write; without it changes are persisted immediately
+        """
+        self._on_change = on_change
+        self._lock_obj: Optional[asyncio.Lock] = None  # Created on first use, see _lock
         self.pet_id = pet_id
         self.name = name
-        self.species = species
-        self.stats = stats
+        self.species = sys.intern(species)  # Small closed set; share one string per species
+        self._stats = [stats['hunger'], stats['energy'], stats['hygiene'], stats['happiness']]
         self._state = PetStatus.NORMAL  # Update to use PetStatus enum
-        self._lock = asyncio.Lock()
         self.last_update = datetime.now(timezone.utc)
-        self.interaction_history = {}
+        self._base_time = time.monotonic()  # Decay clock for _stats; last_update is the wall-clock mirror
+        # Monotonic time of the last use of each InteractionType, indexed by its value
+        self.interaction_history = [float('-inf')] * len(InteractionType)
+        self.treat_count = 0
+        self.last_treat_reset = self.last_update
+    @property
+    def _lock(self) -> asyncio.Lock:
+        """Per-pet lock, allocated lazily since most cached pets are never interacted with."""
+        lock = self._lock_obj
+        if lock is None:
+            lock = self._lock_obj = asyncio.Lock()
+        return lock
+    def _decayed(self, hours: int) -> List[int]:
+        """Returns the base stats after the given number of whole hours of decay."""
+        return [max(0, value - rate * hours) for value, rate in zip(self._stats, self._DECAY)]
+    @staticmethod
+    def _status_for(stats: List[int]) -> PetStatus:
+        """Derives the pet's status from its stats."""
+        # Index bits: low hygiene (2) | low happiness (1); low hygiene wins
+        return _STATUS_LUT[(stats[HYGIENE] < 30) * 2 + (stats[HAPPINESS] < 30)]
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the pet's current stats keyed by name."""
+        hours = int((time.monotonic() - self._base_time) // 3600)
+        stats = self._decayed(hours) if hours else self._stats
+        return {
+            'happiness': stats[HAPPINESS],
+            'hunger': stats[HUNGER],
+            'energy': stats[ENERGY],
+            'hygiene': stats[HYGIENE]
+        }
     @property
     def state(self) -> PetStatus:
         """Get current pet state."""
+        hours = int((time.monotonic() - self._base_time) // 3600)
+        if hours:
+            return self._status_for(self._decayed(hours))
         return self._state
     async def set_state(self, new_state: PetStatus) -> None:
         """Thread-safe setter for pet state."""
         async with self._lock:
-            self._state = new_state
+            self._set_state_locked(new_state)
+    def _set_state_locked(self, new_state: PetStatus) -> None:
+        """Set pet state; caller must already hold self._lock."""
+        self._state = new_state
     async def update(self) -> None:
         """Update pet stats based on time elapsed."""
-        async with self._lock:
-            now = datetime.now(timezone.utc)
-            time_elapsed = (now - self.last_update).total_seconds()
+        self.tick(time.monotonic())
+    def tick(self, now: float) -> bool:
+        """
+        Folds whole hours of decay elapsed since _base_time into the stored stats.
+        
+        Args:
+            now: time.monotonic() reading
             
-            # Update stats based on time elapsed (every hour)
-            hours_elapsed = time_elapsed / 3600
-            if hours_elapsed >= 1:
-                # Decrease stats over time
-                self.stats['hunger'] = max(0, self.stats['hunger'] - int(5 * hours_elapsed))
-                self.stats['energy'] = max(0, self.stats['energy'] - int(3 * hours_elapsed))
-                self.stats['hygiene'] = max(0, self.stats['hygiene'] - int(4 * hours_elapsed))
-                self.stats['happiness'] = max(0, self.stats['happiness'] - int(2 * hours_elapsed))
-                
-                # Update state based on stats
-                if self.stats['hygiene'] < 30:
-                    await self.set_state(PetStatus.SICK)
-                elif self.stats['happiness'] < 30:
-                    await self.set_state(PetStatus.UNHAPPY)
-                else:
-                    await self.set_state(PetStatus.NORMAL)
-                
-                self.last_update = now
-class PetStateManager:
-    """Manages pet states and handles stat calculations."""
-    def __init__(self):
-        self._pet_states = {}
-        self._lock = asyncio.Lock()
-        self._operation_counter = AtomicCounter()
+        Returns:
+            bool: True if the stored stats changed
+        """
+        hours = int((now - self._base_time) // 3600)
+        if hours < 1:
+            return False
+            
+        decayed = self._decayed(hours)
+        self._stats[:] = decayed
+        # Advance by whole hours only so the partial hour keeps counting
+        self._base_time += hours * 3600
+        self.last_update = datetime.now(timezone.utc)
+        self._state = self._status_for(decayed)
+        return True
+    async def process_interaction(
+        self,
+        interaction_type: InteractionType
+    ) -> Tuple[bool, str]:
+        """
+        Processes a user interaction with the pet.
         
-    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-        """Get or create a pet state for the given pet ID."""
-        try:
-            async with self._lock:
-                if pet_id not in self._pet_states:
-                    # Load pet data from database
-                    pet_data = get_pet_stats(pet_id)
-                    if not pet_data:
-                        logger.error(f"Failed to load stats for pet {pet_id}")
-                        return None
-                    
-                    # Create new pet state
-                    self._pet_states[pet_id] = PetState(
-                        pet_id=pet_id,
-                        name=pet_data['name'],
-                        species=pet_data['species'],
-                        stats=pet_data['stats']
-                    )
+        Args:
+            interaction_type: Type of interaction to process
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        async with self._lock:
+            try:
+                effect = INTERACTION_EFFECTS_TABLE[interaction_type]
+                now = datetime.now(timezone.utc)
+                now_mono = time.monotonic()
                 
-                return self._pet_states[pet_id]
+                # Bring the stored stats up to date before checking and mutating them
+                self.tick(now_mono)
                 
-        except Exception as e:
-            logger.error(f"Error getting pet state: {e}")
-            logger.error(traceback.format_exc())
-            return None
-        if pet_id not in self.states:
-            # Load initial stats from database or use defaults
-            initial_stats = await self.load_pet_stats(pet_id)
-            self.states[pet_id] = PetState(pet_id, initial_stats)
-        return self.states[pet_id]
-        
-    async def load_pet_stats(self, pet_id: int):
-        """Load pet stats from database"""
-        # Implement database loading logic here
-        # For now, return default stats
-        return {
-            'hunger': 100,
-            'happiness': 100,
-            'energy': 100,
-            'hygiene': 100
-        }
-
-@dataclass
-class InteractionEffect:
-    """Defines the effects and requirements of a pet interaction."""
-    happiness: int
-    hunger: int
-    energy: int
-    hygiene: int
-    cooldown: timedelta
-    conditions: Dict[str, Any]
-    """Thread-safe counter for tracking atomic operations."""
-    def __init__(self):
-        self._value = 0
-        self._lock = asyncio.Lock()
-    
-    async def increment(self) -> int:
-        async with self._lock:
-            self._value += 1
-            return self._value
-    
-    async def get_value(self) -> int:
-        async with self._lock:
-            return self._value
-        class PetStateManager:
-            """Manages individual pet state and handles stat calculations."""
-            def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                """
-                Initialize pet state manager.
+                if now_mono - self.interaction_history[interaction_type] < INTERACTION_COOLDOWNS[interaction_type]:
+                    return False, "This interaction is on cooldown"
                 
-                Args:
-                    pet_id: Unique identifier for the pet
-                    initial_stats: Dictionary containing pet's initial stats
-                """
-                self.pet_id = pet_id
-                self.name = initial_stats['name']
-                self.species = initial_stats['species']
-                self.stats = initial_stats['stats'].copy()
-                self._state = PetState.NORMAL  # Private state variable
-                self._state_lock = asyncio.Lock()  # Lock for state transitions
-                self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                self.last_update = initial_stats['last_update']
-                self.interaction_history: Dict[InteractionType, datetime] = {}
-                self.treat_count = 0
-                self.last_treat_reset = datetime.now(timezone.utc)
-                self._operation_counter = AtomicCounter()
-                self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                self._last_verified_state: Optional[Dict[str, Any]] = None
-                self._last_persistence_time = datetime.now(timezone.utc)
-                self._lock = asyncio.Lock()  # Add lock attribute
-                def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                    """
-                    Initialize pet state manager.
-                    
-                    Args:
-                        pet_id: Unique identifier for the pet
-                        initial_stats: Dictionary containing pet's initial stats
-                    """
-                    self.pet_id = pet_id
-                    self.name = initial_stats['name']
-                    self.species = initial_stats['species']
-                    self.stats = initial_stats['stats'].copy()
-                    self._state = PetState.NORMAL  # Private state variable
-                    self._state_lock = asyncio.Lock()  # Lock for state transitions
-                    self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                    self.last_update = initial_stats['last_update']
-                    self.interaction_history: Dict[InteractionType, datetime] = {}
+                # Treat allowance resets once per UTC day
+                if now.date() != self.last_treat_reset.date():
                     self.treat_count = 0
-                    self.last_treat_reset = datetime.now(timezone.utc)
-                    self._operation_counter = AtomicCounter()
-                    self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                    self._last_verified_state: Optional[Dict[str, Any]] = None
-                    self._last_persistence_time = datetime.now(timezone.utc)
-                    self._lock = asyncio.Lock()  # Add lock attribute
-                    class PetStateManager:
-                        """Initialize the pet state manager."""
-                        self._pet_states = {}
-                        self._lock = asyncio.Lock()
-                    
-                    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-                        """Get or create a pet state for the given pet ID."""
-                        try:
-                            async with self._lock:
-                                if pet_id not in self._pet_states:
-                                    # Load pet data from database
-                                    pet_data = get_pet_stats(pet_id)
-                                    if not pet_data:
-                                        logger.error(f"Failed to load stats for pet {pet_id}")
-                                        return None
-                                    
-                                    # Create new pet state
-                                    self._pet_states[pet_id] = PetState(
-                                        pet_id=pet_id,
-                                        name=pet_data['name'],
-                                        species=pet_data['species'],
-                                        stats=pet_data['stats']
-                                    )
-                                
-                                return self._pet_states[pet_id]
-                                
-                        except Exception as e:
-                            logger.error(f"Error getting pet state: {e}")
-                            logger.error(traceback.format_exc())
-class PetState:
-    def __init__(self, pet_id: int, name: str, species: str, stats: Dict[str, int]):
-        """Initialize pet state."""
-        self.pet_id = pet_id
-        self.name = name
-        self.species = species
-        self.stats = stats
-        self._state = PetStatus.NORMAL  # Update to use PetStatus enum
-        self._lock = asyncio.Lock()
-        self.last_update = datetime.now(timezone.utc)
-        self.interaction_history = {}
-    @property
-    def state(self) -> PetStatus:
-        """Get current pet state."""
-        return self._state
-    async def set_state(self, new_state: PetStatus) -> None:
-        """Thread-safe setter for pet state."""
-        async with self._lock:
-            self._state = new_state
-    async def update(self) -> None:
-        """Update pet stats based on time elapsed."""
-        async with self._lock:
-            now = datetime.now(timezone.utc)
-            time_elapsed = (now - self.last_update).total_seconds()
-            
-            # Update stats based on time elapsed (every hour)
-            hours_elapsed = time_elapsed / 3600
-            if hours_elapsed >= 1:
-                # Decrease stats over time
-                self.stats['hunger'] = max(0, self.stats['hunger'] - int(5 * hours_elapsed))
-                self.stats['energy'] = max(0, self.stats['energy'] - int(3 * hours_elapsed))
-                self.stats['hygiene'] = max(0, self.stats['hygiene'] - int(4 * hours_elapsed))
-                self.stats['happiness'] = max(0, self.stats['happiness'] - int(2 * hours_elapsed))
+                    self.last_treat_reset = now
                 
-                # Update state based on stats
-                if self.stats['hygiene'] < 30:
-                    await self.set_state(PetStatus.SICK)
-                elif self.stats['happiness'] < 30:
-                    await self.set_state(PetStatus.UNHAPPY)
-                else:
-                    await self.set_state(PetStatus.NORMAL)
+                failure = INTERACTION_CHECKERS[interaction_type](self)
+                if failure is not None:
+                    return False, failure
                 
-                self.last_update = now
-class PetStateManager:
-    """Manages pet states and handles stat calculations."""
-    def __init__(self):
-        self._pet_states = {}
-        self._lock = asyncio.Lock()
-        self._operation_counter = AtomicCounter()
-        
-    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-        """Get or create a pet state for the given pet ID."""
-        try:
-            async with self._lock:
-                if pet_id not in self._pet_states:
-                    # Load pet data from database
-                    pet_data = get_pet_stats(pet_id)
-                    if not pet_data:
-                        logger.error(f"Failed to load stats for pet {pet_id}")
-                        return None
-                    
-                    # Create new pet state
-                    self._pet_states[pet_id] = PetState(
-                        pet_id=pet_id,
-                        name=pet_data['name'],
-                        species=pet_data['species'],
-                        stats=pet_data['stats']
-                    )
+                if interaction_type is InteractionType.TREAT:
+                    self.treat_count += 1
                 
-                return self._pet_states[pet_id]
+                stats = self._stats
+                stats[HAPPINESS] = max(0, min(100, stats[HAPPINESS] + effect.happiness))
+                stats[HUNGER] = max(0, min(100, stats[HUNGER] + effect.hunger))
+                stats[ENERGY] = max(0, min(100, stats[ENERGY] + effect.energy))
+                stats[HYGIENE] = max(0, min(100, stats[HYGIENE] + effect.hygiene))
                 
-        except Exception as e:
-            logger.error(f"Error getting pet state: {e}")
-            logger.error(traceback.format_exc())
-            return None
-        if pet_id not in self.states:
-            # Load initial stats from database or use defaults
-            initial_stats = await self.load_pet_stats(pet_id)
-            self.states[pet_id] = PetState(pet_id, initial_stats)
-        return self.states[pet_id]
-        
-    async def load_pet_stats(self, pet_id: int):
-        """Load pet stats from database"""
-        # Implement database loading logic here
-        # For now, return default stats
-        return {
-            'hunger': 100,
-            'happiness': 100,
-            'energy': 100,
-            'hygiene': 100
-        }
-
-@dataclass
-class InteractionEffect:
-    """Defines the effects and requirements of a pet interaction."""
-    happiness: int
-    hunger: int
-    energy: int
-    hygiene: int
-    cooldown: timedelta
-    conditions: Dict[str, Any]
-    """Thread-safe counter for tracking atomic operations."""
-    def __init__(self):
-        self._value = 0
-        self._lock = asyncio.Lock()
-    
-    async def increment(self) -> int:
-        async with self._lock:
-            self._value += 1
-            return self._value
-    
-    async def get_value(self) -> int:
-        async with self._lock:
-            return self._value
-        class PetStateManager:
-            """Manages individual pet state and handles stat calculations."""
-            def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                """
-                Initialize pet state manager.
+                if interaction_type is InteractionType.SLEEP:
+                    self._set_state_locked(PetStatus.SLEEPING)
+                elif self._state is not PetStatus.SLEEPING or interaction_type is InteractionType.WAKE:
+                    self._set_state_locked(self._status_for(stats))
                 
-                Args:
-                    pet_id: Unique identifier for the pet
-                    initial_stats: Dictionary containing pet's initial stats
-                """
-                self.pet_id = pet_id
-                self.name = initial_stats['name']
-                self.species = initial_stats['species']
-                self.stats = initial_stats['stats'].copy()
-                self._state = PetState.NORMAL  # Private state variable
-                self._state_lock = asyncio.Lock()  # Lock for state transitions
-                self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                self.last_update = initial_stats['last_update']
-                self.interaction_history: Dict[InteractionType, datetime] = {}
-                self.treat_count = 0
-                self.last_treat_reset = datetime.now(timezone.utc)
-                self._operation_counter = AtomicCounter()
-                self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                self._last_verified_state: Optional[Dict[str, Any]] = None
-                self._last_persistence_time = datetime.now(timezone.utc)
-                self._lock = asyncio.Lock()  # Add lock attribute
-                def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                    """
-                    Initialize pet state manager.
-                    
-                    Args:
-                        pet_id: Unique identifier for the pet
-                        initial_stats: Dictionary containing pet's initial stats
-                    """
-                    self.pet_id = pet_id
-                    self.name = initial_stats['name']
-                    self.species = initial_stats['species']
-                    self.stats = initial_stats['stats'].copy()
-                    self._state = PetState.NORMAL  # Private state variable
-                    self._state_lock = asyncio.Lock()  # Lock for state transitions
-                    self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                    self.last_update = initial_stats['last_update']
-                    self.interaction_history: Dict[InteractionType, datetime] = {}
-                    self.treat_count = 0
-                    self.last_treat_reset = datetime.now(timezone.utc)
-                    self._operation_counter = AtomicCounter()
-                    self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                    self._last_verified_state: Optional[Dict[str, Any]] = None
-                    self._last_persistence_time = datetime.now(timezone.utc)
-                    self._lock = asyncio.Lock()  # Add lock attribute
-                    class PetStateManager:
-                        """Initialize the pet state manager."""
-                        self._pet_states = {}
-                        self._lock = asyncio.Lock()
-                    
-                    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-                        """Get or create a pet state for the given pet ID."""
-                        try:
-                            async with self._lock:
-                                if pet_id not in self._pet_states:
-                                    # Load pet data from database
-                                    pet_data = get_pet_stats(pet_id)
-                                    if not pet_data:
-                                        logger.error(f"Failed to load stats for pet {pet_id}")
-                                        return None
-                                    
-                                    # Create new pet state
-                                    self._pet_states[pet_id] = PetState(
-                                        pet_id=pet_id,
-                                        name=pet_data['name'],
-                                        species=pet_data['species'],
-                                        stats=pet_data['stats']
-                                    )
-                                
-                                return self._pet_states[pet_id]
-                                
-                        except Exception as e:
-                            logger.error(f"Error getting pet state: {e}")
-                            logger.error(traceback.format_exc())
-class PetState:
-    def __init__(self, pet_id: int, name: str, species: str, stats: Dict[str, int]):
-        """Initialize pet state."""
-        self.pet_id = pet_id
-        self.name = name
-        self.species = species
-        self.stats = stats
-        self._state = PetStatus.NORMAL  # Update to use PetStatus enum
-        self._lock = asyncio.Lock()
-        self.last_update = datetime.now(timezone.utc)
-        self.interaction_history = {}
-    @property
-    def state(self) -> PetStatus:
-        """Get current pet state."""
-        return self._state
-    async def set_state(self, new_state: PetStatus) -> None:
-        """Thread-safe setter for pet state."""
-        async with self._lock:
-            self._state = new_state
-    async def update(self) -> None:
-        """Update pet stats based on time elapsed."""
-        async with self._lock:
-            now = datetime.now(timezone.utc)
-            time_elapsed = (now - self.last_update).total_seconds()
-            
-            # Update stats based on time elapsed (every hour)
-            hours_elapsed = time_elapsed / 3600
-            if hours_elapsed >= 1:
-                # Decrease stats over time
-                self.stats['hunger'] = max(0, self.stats['hunger'] - int(5 * hours_elapsed))
-                self.stats['energy'] = max(0, self.stats['energy'] - int(3 * hours_elapsed))
-                self.stats['hygiene'] = max(0, self.stats['hygiene'] - int(4 * hours_elapsed))
-                self.stats['happiness'] = max(0, self.stats['happiness'] - int(2 * hours_elapsed))
+                self.interaction_history[interaction_type] = now_mono
                 
-                # Update state based on stats
-                if self.stats['hygiene'] < 30:
-                    await self.set_state(PetStatus.SICK)
-                elif self.stats['happiness'] < 30:
-                    await self.set_state(PetStatus.UNHAPPY)
+                if self._on_change is not None:
+                    self._on_change(self.pet_id, interaction_type.name.lower(), self.stats)
                 else:
-                    await self.set_state(PetStatus.NORMAL)
-                
-                self.last_update = now
-class PetStateManager:
-    """Manages pet states and handles stat calculations."""
-    def __init__(self):
-        self._pet_states = {}
-        self._lock = asyncio.Lock()
-        self._operation_counter = AtomicCounter()
-        
-    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-        """Get or create a pet state for the given pet ID."""
-        try:
-            async with self._lock:
-                if pet_id not in self._pet_states:
-                    # Load pet data from database
-                    pet_data = get_pet_stats(pet_id)
-                    if not pet_data:
-                        logger.error(f"Failed to load stats for pet {pet_id}")
-                        return None
-                    
-                    # Create new pet state
-                    self._pet_states[pet_id] = PetState(
-                        pet_id=pet_id,
-                        name=pet_data['name'],
-                        species=pet_data['species'],
-                        stats=pet_data['stats']
+                    # self.stats is a fresh dict, safe to hand to the worker thread
+                    await asyncio.to_thread(
+                        update_pet_stats,
+                        self.pet_id,
+                        self.stats,
+                        interaction_type.name.lower()
                     )
                 
-                return self._pet_states[pet_id]
+                return True, "Interaction successful!"
                 
-        except Exception as e:
-            logger.error(f"Error getting pet state: {e}")
-            logger.error(traceback.format_exc())
-            return None
-        if pet_id not in self.states:
-            # Load initial stats from database or use defaults
-            initial_stats = await self.load_pet_stats(pet_id)
-            self.states[pet_id] = PetState(pet_id, initial_stats)
-        return self.states[pet_id]
-        
-    async def load_pet_stats(self, pet_id: int):
-        """Load pet stats from database"""
-        # Implement database loading logic here
-        # For now, return default stats
-        return {
-            'hunger': 100,
-            'happiness': 100,
-            'energy': 100,
-            'hygiene': 100
-        }
+            except Exception as e:
+                logger.error(f"Error processing interaction for pet {self.pet_id}: {e}")
+                logger.error(traceback.format_exc())
+                return False, "An error occurred processing your interaction"
 
-@dataclass
-class InteractionEffect:
-    """Defines the effects and requirements of a pet interaction."""
-    happiness: int
-    hunger: int
-    energy: int
-    hygiene: int
-    cooldown: timedelta
-    conditions: Dict[str, Any]
-    """Thread-safe counter for tracking atomic operations."""
-    def __init__(self):
-        self._value = 0
-        self._lock = asyncio.Lock()
-    
-    async def increment(self) -> int:
-        async with self._lock:
-            self._value += 1
-            return self._value
-    
-    async def get_value(self) -> int:
-        async with self._lock:
-            return self._value
-        class PetStateManager:
-            """Manages individual pet state and handles stat calculations."""
-            def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                """
-                Initialize pet state manager.
-                
-                Args:
-                    pet_id: Unique identifier for the pet
-                    initial_stats: Dictionary containing pet's initial stats
-                """
-                self.pet_id = pet_id
-                self.name = initial_stats['name']
-                self.species = initial_stats['species']
-                self.stats = initial_stats['stats'].copy()
-                self._state = PetState.NORMAL  # Private state variable
-                self._state_lock = asyncio.Lock()  # Lock for state transitions
-                self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                self.last_update = initial_stats['last_update']
-                self.interaction_history: Dict[InteractionType, datetime] = {}
-                self.treat_count = 0
-                self.last_treat_reset = datetime.now(timezone.utc)
-                self._operation_counter = AtomicCounter()
-                self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                self._last_verified_state: Optional[Dict[str, Any]] = None
-                self._last_persistence_time = datetime.now(timezone.utc)
-                self._lock = asyncio.Lock()  # Add lock attribute
-                def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                    """
-                    Initialize pet state manager.
-                    
-                    Args:
-                        pet_id: Unique identifier for the pet
-                        initial_stats: Dictionary containing pet's initial stats
-                    """
-                    self.pet_id = pet_id
-                    self.name = initial_stats['name']
-                    self.species = initial_stats['species']
-                    self.stats = initial_stats['stats'].copy()
-                    self._state = PetState.NORMAL  # Private state variable
-                    self._state_lock = asyncio.Lock()  # Lock for state transitions
-                    self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                    self.last_update = initial_stats['last_update']
-                    self.interaction_history: Dict[InteractionType, datetime] = {}
-                    self.treat_count = 0
-                    self.last_treat_reset = datetime.now(timezone.utc)
-                    self._operation_counter = AtomicCounter()
-                    self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                    self._last_verified_state: Optional[Dict[str, Any]] = None
-                    self._last_persistence_time = datetime.now(timezone.utc)
-                    self._lock = asyncio.Lock()  # Add lock attribute
-                    class PetStateManager:
-                        """Initialize the pet state manager."""
-                        self._pet_states = {}
-                        self._lock = asyncio.Lock()
-                    
-                    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-                        """Get or create a pet state for the given pet ID."""
-                        try:
-                            async with self._lock:
-                                if pet_id not in self._pet_states:
-                                    # Load pet data from database
-                                    pet_data = get_pet_stats(pet_id)
-                                    if not pet_data:
-                                        logger.error(f"Failed to load stats for pet {pet_id}")
-                                        return None
-                                    
-                                    # Create new pet state
-                                    self._pet_states[pet_id] = PetState(
-                                        pet_id=pet_id,
-                                        name=pet_data['name'],
-                                        species=pet_data['species'],
-                                        stats=pet_data['stats']
-                                    )
-                                
-                                return self._pet_states[pet_id]
-                                
-                        except Exception as e:
-                            logger.error(f"Error getting pet state: {e}")
-                            logger.error(traceback.format_exc())
-class PetState:
-    def __init__(self, pet_id: int, name: str, species: str, stats: Dict[str, int]):
-        """Initialize pet state."""
-        self.pet_id = pet_id
-        self.name = name
-        self.species = species
-        self.stats = stats
-        self._state = PetStatus.NORMAL  # Update to use PetStatus enum
-        self._lock = asyncio.Lock()
-        self.last_update = datetime.now(timezone.utc)
-        self.interaction_history = {}
-    @property
-    def state(self) -> PetStatus:
-        """Get current pet state."""
-        return self._state
-    async def set_state(self, new_state: PetStatus) -> None:
-        """Thread-safe setter for pet state."""
-        async with self._lock:
-            self._state = new_state
-    async def update(self) -> None:
-        """Update pet stats based on time elapsed."""
-        async with self._lock:
-            now = datetime.now(timezone.utc)
-            time_elapsed = (now - self.last_update).total_seconds()
+class PetStatsLoader:
+    """Coalesces pet stat lookups that arrive within a short window into one bulk query."""
+    def __init__(self, window: float = 0.005):
+        """
+        Initialize the loader.
+        
+        Args:
+            window: Seconds to wait for more lookups before querying
+        """
+        self._window = window
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._dispatch_task: Optional[asyncio.Task] = None
+        
+    async def load(self, pet_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Loads one pet's stats as part of the next batch.
+        
+        Args:
+            pet_id: ID of the pet to load
             
-            # Update stats based on time elapsed (every hour)
-            hours_elapsed = time_elapsed / 3600
-            if hours_elapsed >= 1:
-                # Decrease stats over time
-                self.stats['hunger'] = max(0, self.stats['hunger'] - int(5 * hours_elapsed))
-                self.stats['energy'] = max(0, self.stats['energy'] - int(3 * hours_elapsed))
-                self.stats['hygiene'] = max(0, self.stats['hygiene'] - int(4 * hours_elapsed))
-                self.stats['happiness'] = max(0, self.stats['happiness'] - int(2 * hours_elapsed))
-                
-                # Update state based on stats
-                if self.stats['hygiene'] < 30:
-                    await self.set_state(PetStatus.SICK)
-                elif self.stats['happiness'] < 30:
-                    await self.set_state(PetStatus.UNHAPPY)
-                else:
-                    await self.set_state(PetStatus.NORMAL)
-                
-                self.last_update = now
-class PetStateManager:
-    """Manages pet states and handles stat calculations."""
-    def __init__(self):
-        self._pet_states = {}
-        self._lock = asyncio.Lock()
-        self._operation_counter = AtomicCounter()
+        Returns:
+            Same structure as get_pet_stats, or None if the pet was not found
+        """
+        future = self._pending.get(pet_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[pet_id] = future
+            if self._dispatch_task is None or self._dispatch_task.done():
+                self._dispatch_task = loop.create_task(self._dispatch())
+        return await asyncio.shield(future)
         
-    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-        """Get or create a pet state for the given pet ID."""
+    async def _dispatch(self) -> None:
+        """Resolves pending lookups in batches until none are left."""
+        # Lookups that arrive while a query is running land in a fresh _pending
+        # and are picked up by the next pass; load() won't start a second task
+        # while this one is alive.
         try:
-            async with self._lock:
-                if pet_id not in self._pet_states:
-                    # Load pet data from database
-                    pet_data = get_pet_stats(pet_id)
-                    if not pet_data:
-                        logger.error(f"Failed to load stats for pet {pet_id}")
-                        return None
-                    
-                    # Create new pet state
-                    self._pet_states[pet_id] = PetState(
-                        pet_id=pet_id,
-                        name=pet_data['name'],
-                        species=pet_data['species'],
-                        stats=pet_data['stats']
-                    )
-                
-                return self._pet_states[pet_id]
-                
+            while self._pending:
+                await self._dispatch_batch()
+        finally:
+            # Cancelled mid-query: don't strand lookups queued behind this batch
+            pending = self._pending
+            self._pending = {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_result(None)
+            
+    async def _dispatch_batch(self) -> None:
+        """Waits out the batching window, then resolves every pending lookup from one query."""
+        results: Dict[int, Dict[str, Any]] = {}
+        pending: Dict[int, asyncio.Future] = {}
+        try:
+            await asyncio.sleep(self._window)
+            pending = self._pending
+            self._pending = {}
+            results = await asyncio.to_thread(get_pet_stats_many, list(pending))
+            
         except Exception as e:
-            logger.error(f"Error getting pet state: {e}")
+            logger.error(f"Error batch loading pet stats: {e}")
             logger.error(traceback.format_exc())
-            return None
-        if pet_id not in self.states:
-            # Load initial stats from database or use defaults
-            initial_stats = await self.load_pet_stats(pet_id)
-            self.states[pet_id] = PetState(pet_id, initial_stats)
-        return self.states[pet_id]
-        
-    async def load_pet_stats(self, pet_id: int):
-        """Load pet stats from database"""
-        # Implement database loading logic here
-        # For now, return default stats
-        return {
-            'hunger': 100,
-            'happiness': 100,
-            'energy': 100,
-            'hygiene': 100
-        }
+        finally:
+            # Also runs on cancellation, so no caller is left waiting forever
+            if not pending:
+                pending = self._pending
+                self._pending = {}
+            for pet_id, future in pending.items():
+                if not future.done():
+                    future.set_result(results.get(pet_id))
 
-@dataclass
-class InteractionEffect:
-    """Defines the effects and requirements of a pet interaction."""
-    happiness: int
-    hunger: int
-    energy: int
-    hygiene: int
-    cooldown: timedelta
-    conditions: Dict[str, Any]
-    """Thread-safe counter for tracking atomic operations."""
-    def __init__(self):
-        self._value = 0
-        self._lock = asyncio.Lock()
-    
-    async def increment(self) -> int:
-        async with self._lock:
-            self._value += 1
-            return self._value
-    
-    async def get_value(self) -> int:
-        async with self._lock:
-            return self._value
-        class PetStateManager:
-            """Manages individual pet state and handles stat calculations."""
-            def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                """
-                Initialize pet state manager.
-                
-                Args:
-                    pet_id: Unique identifier for the pet
-                    initial_stats: Dictionary containing pet's initial stats
-                """
-                self.pet_id = pet_id
-                self.name = initial_stats['name']
-                self.species = initial_stats['species']
-                self.stats = initial_stats['stats'].copy()
-                self._state = PetState.NORMAL  # Private state variable
-                self._state_lock = asyncio.Lock()  # Lock for state transitions
-                self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                self.last_update = initial_stats['last_update']
-                self.interaction_history: Dict[InteractionType, datetime] = {}
-                self.treat_count = 0
-                self.last_treat_reset = datetime.now(timezone.utc)
-                self._operation_counter = AtomicCounter()
-                self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                self._last_verified_state: Optional[Dict[str, Any]] = None
-                self._last_persistence_time = datetime.now(timezone.utc)
-                self._lock = asyncio.Lock()  # Add lock attribute
-                def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                    """
-                    Initialize pet state manager.
-                    
-                    Args:
-                        pet_id: Unique identifier for the pet
-                        initial_stats: Dictionary containing pet's initial stats
-                    """
-                    self.pet_id = pet_id
-                    self.name = initial_stats['name']
-                    self.species = initial_stats['species']
-                    self.stats = initial_stats['stats'].copy()
-                    self._state = PetState.NORMAL  # Private state variable
-                    self._state_lock = asyncio.Lock()  # Lock for state transitions
-                    self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                    self.last_update = initial_stats['last_update']
-                    self.interaction_history: Dict[InteractionType, datetime] = {}
-                    self.treat_count = 0
-                    self.last_treat_reset = datetime.now(timezone.utc)
-                    self._operation_counter = AtomicCounter()
-                    self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                    self._last_verified_state: Optional[Dict[str, Any]] = None
-                    self._last_persistence_time = datetime.now(timezone.utc)
-                    self._lock = asyncio.Lock()  # Add lock attribute
-                    class PetStateManager:
-                        """Initialize the pet state manager."""
-                        self._pet_states = {}
-                        self._lock = asyncio.Lock()
-                    
-                    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-                        """Get or create a pet state for the given pet ID."""
-                        try:
-                            async with self._lock:
-                                if pet_id not in self._pet_states:
-                                    # Load pet data from database
-                                    pet_data = get_pet_stats(pet_id)
-                                    if not pet_data:
-                                        logger.error(f"Failed to load stats for pet {pet_id}")
-                                        return None
-                                    
-                                    # Create new pet state
-                                    self._pet_states[pet_id] = PetState(
-                                        pet_id=pet_id,
-                                        name=pet_data['name'],
-                                        species=pet_data['species'],
-                                        stats=pet_data['stats']
-                                    )
-                                
-                                return self._pet_states[pet_id]
-                                
-                        except Exception as e:
-                            logger.error(f"Error getting pet state: {e}")
-                            logger.error(traceback.format_exc())
-class PetState:
-    def __init__(self, pet_id: int, name: str, species: str, stats: Dict[str, int]):
-        """Initialize pet state."""
-        self.pet_id = pet_id
-        self.name = name
-        self.species = species
-        self.stats = stats
-        self._state = PetStatus.NORMAL  # Update to use PetStatus enum
-        self._lock = asyncio.Lock()
-        self.last_update = datetime.now(timezone.utc)
-        self.interaction_history = {}
-    @property
-    def state(self) -> PetStatus:
-        """Get current pet state."""
-        return self._state
-    async def set_state(self, new_state: PetStatus) -> None:
-        """Thread-safe setter for pet state."""
-        async with self._lock:
-            self._state = new_state
-    async def update(self) -> None:
-        """Update pet stats based on time elapsed."""
-        async with self._lock:
-            now = datetime.now(timezone.utc)
-            time_elapsed = (now - self.last_update).total_seconds()
-            
-            # Update stats based on time elapsed (every hour)
-            hours_elapsed = time_elapsed / 3600
-            if hours_elapsed >= 1:
-                # Decrease stats over time
-                self.stats['hunger'] = max(0, self.stats['hunger'] - int(5 * hours_elapsed))
-                self.stats['energy'] = max(0, self.stats['energy'] - int(3 * hours_elapsed))
-                self.stats['hygiene'] = max(0, self.stats['hygiene'] - int(4 * hours_elapsed))
-                self.stats['happiness'] = max(0, self.stats['happiness'] - int(2 * hours_elapsed))
-                
-                # Update state based on stats
-                if self.stats['hygiene'] < 30:
-                    await self.set_state(PetStatus.SICK)
-                elif self.stats['happiness'] < 30:
-                    await self.set_state(PetStatus.UNHAPPY)
-                else:
-                    await self.set_state(PetStatus.NORMAL)
-                
-                self.last_update = now
 class PetStateManager:
     """Manages pet states and handles stat calculations."""
+    FLUSH_INTERVAL = 2  # Seconds between write-behind flushes
+    MAX_FLUSH_ATTEMPTS = 3  # Failed flushes before a buffered write is dropped
+    
     def __init__(self):
         self._pet_states = {}
-        self._lock = asyncio.Lock()
+        self._dirty: Dict[int, Dict[str, int]] = {}  # pet_id -> latest unsaved stats
+        self._pending_interactions: List[Tuple[int, str, str]] = []
+        self._stat_attempts: Dict[int, int] = {}  # pet_id -> failed flushes of its buffered stats
+        self._retry_interactions: List[Tuple[Tuple[int, str, str], int]] = []  # (row, failed flushes)
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()  # One flush at a time so snapshots land in order
+        self._loading: Dict[int, asyncio.Future] = {}  # pet_id -> in-flight load result
+        self._loader = PetStatsLoader()
         self._operation_counter = AtomicCounter()
         
-    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-        """Get or create a pet state for the given pet ID."""
-        try:
-            async with self._lock:
-                if pet_id not in self._pet_states:
-                    # Load pet data from database
-                    pet_data = get_pet_stats(pet_id)
-                    if not pet_data:
-                        logger.error(f"Failed to load stats for pet {pet_id}")
-                        return None
-                    
-                    # Create new pet state
-                    self._pet_states[pet_id] = PetState(
-                        pet_id=pet_id,
-                        name=pet_data['name'],
-                        species=pet_data['species'],
-                        stats=pet_data['stats']
-                    )
-                
-                return self._pet_states[pet_id]
-                
-        except Exception as e:
-            logger.error(f"Error getting pet state: {e}")
-            logger.error(traceback.format_exc())
-            return None
-        if pet_id not in self.states:
-            # Load initial stats from database or use defaults
-            initial_stats = await self.load_pet_stats(pet_id)
-            self.states[pet_id] = PetState(pet_id, initial_stats)
-        return self.states[pet_id]
+    def _new_pet_state(self, pet_id: int, pet_data: Dict[str, Any]) -> PetState:
+        """Builds a PetState from loaded pet data."""
+        return PetState(
+            pet_id=pet_id,
+            name=pet_data['name'],
+            species=pet_data['species'],
+            stats=pet_data['stats'],
+            on_change=self._mark_dirty
+        )
         
-    async def load_pet_stats(self, pet_id: int):
-        """Load pet stats from database"""
-        # Implement database loading logic here
-        # For now, return default stats
-        return {
-            'hunger': 100,
-            'happiness': 100,
-            'energy': 100,
-            'hygiene': 100
-        }
-
-@dataclass
-class InteractionEffect:
-    """Defines the effects and requirements of a pet interaction."""
-    happiness: int
-    hunger: int
-    energy: int
-    hygiene: int
-    cooldown: timedelta
-    conditions: Dict[str, Any]
-    """Thread-safe counter for tracking atomic operations."""
-    def __init__(self):
-        self._value = 0
-        self._lock = asyncio.Lock()
-    
-    async def increment(self) -> int:
-        async with self._lock:
-            self._value += 1
-            return self._value
-    
-    async def get_value(self) -> int:
-        async with self._lock:
-            return self._value
-        class PetStateManager:
-            """Manages individual pet state and handles stat calculations."""
-            def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                """
-                Initialize pet state manager.
-                
-                Args:
-                    pet_id: Unique identifier for the pet
-                    initial_stats: Dictionary containing pet's initial stats
-                """
-                self.pet_id = pet_id
-                self.name = initial_stats['name']
-                self.species = initial_stats['species']
-                self.stats = initial_stats['stats'].copy()
-                self._state = PetState.NORMAL  # Private state variable
-                self._state_lock = asyncio.Lock()  # Lock for state transitions
-                self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                self.last_update = initial_stats['last_update']
-                self.interaction_history: Dict[InteractionType, datetime] = {}
-                self.treat_count = 0
-                self.last_treat_reset = datetime.now(timezone.utc)
-                self._operation_counter = AtomicCounter()
-                self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                self._last_verified_state: Optional[Dict[str, Any]] = None
-                self._last_persistence_time = datetime.now(timezone.utc)
-                self._lock = asyncio.Lock()  # Add lock attribute
-                def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                    """
-                    Initialize pet state manager.
-                    
-                    Args:
-                        pet_id: Unique identifier for the pet
-                        initial_stats: Dictionary containing pet's initial stats
-                    """
-                    self.pet_id = pet_id
-                    self.name = initial_stats['name']
-                    self.species = initial_stats['species']
-                    self.stats = initial_stats['stats'].copy()
-                    self._state = PetState.NORMAL  # Private state variable
-                    self._state_lock = asyncio.Lock()  # Lock for state transitions
-                    self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                    self.last_update = initial_stats['last_update']
-                    self.interaction_history: Dict[InteractionType, datetime] = {}
-                    self.treat_count = 0
-                    self.last_treat_reset = datetime.now(timezone.utc)
-                    self._operation_counter = AtomicCounter()
-                    self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                    self._last_verified_state: Optional[Dict[str, Any]] = None
-                    self._last_persistence_time = datetime.now(timezone.utc)
-                    self._lock = asyncio.Lock()  # Add lock attribute
-                    class PetStateManager:
-                        """Initialize the pet state manager."""
-                        self._pet_states = {}
-                        self._lock = asyncio.Lock()
-                    
-                    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-                        """Get or create a pet state for the given pet ID."""
-                        try:
-                            async with self._lock:
-                                if pet_id not in self._pet_states:
-                                    # Load pet data from database
-                                    pet_data = get_pet_stats(pet_id)
-                                    if not pet_data:
-                                        logger.error(f"Failed to load stats for pet {pet_id}")
-                                        return None
-                                    
-                                    # Create new pet state
-                                    self._pet_states[pet_id] = PetState(
-                                        pet_id=pet_id,
-                                        name=pet_data['name'],
-                                        species=pet_data['species'],
-                                        stats=pet_data['stats']
-                                    )
-                                
-                                return self._pet_states[pet_id]
-                                
-                        except Exception as e:
-                            logger.error(f"Error getting pet state: {e}")
-                            logger.error(traceback.format_exc())
-class PetState:
-    def __init__(self, pet_id: int, name: str, species: str, stats: Dict[str, int]):
-        """Initialize pet state."""
-        self.pet_id = pet_id
-        self.name = name
-        self.species = species
-        self.stats = stats
-        self._state = PetStatus.NORMAL  # Update to use PetStatus enum
-        self._lock = asyncio.Lock()
-        self.last_update = datetime.now(timezone.utc)
-        self.interaction_history = {}
-    @property
-    def state(self) -> PetStatus:
-        """Get current pet state."""
-        return self._state
-    async def set_state(self, new_state: PetStatus) -> None:
-        """Thread-safe setter for pet state."""
-        async with self._lock:
-            self._state = new_state
-    async def update(self) -> None:
-        """Update pet stats based on time elapsed."""
-        async with self._lock:
-            now = datetime.now(timezone.utc)
-            time_elapsed = (now - self.last_update).total_seconds()
+    def _mark_dirty(self, pet_id: int, interaction_type: str, stats: Dict[str, int]) -> None:
+        """Buffers a pet's changed stats and interaction for the next flush."""
+        self._dirty[pet_id] = stats
+        # stat_changes is a JSON column; a dict repr isn't valid JSON
+        self._pending_interactions.append((pet_id, interaction_type, json.dumps(stats)))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
             
-            # Update stats based on time elapsed (every hour)
-            hours_elapsed = time_elapsed / 3600
-            if hours_elapsed >= 1:
-                # Decrease stats over time
-                self.stats['hunger'] = max(0, self.stats['hunger'] - int(5 * hours_elapsed))
-                self.stats['energy'] = max(0, self.stats['energy'] - int(3 * hours_elapsed))
-                self.stats['hygiene'] = max(0, self.stats['hygiene'] - int(4 * hours_elapsed))
-                self.stats['happiness'] = max(0, self.stats['happiness'] - int(2 * hours_elapsed))
-                
-                # Update state based on stats
-                if self.stats['hygiene'] < 30:
-                    await self.set_state(PetStatus.SICK)
-                elif self.stats['happiness'] < 30:
-                    await self.set_state(PetStatus.UNHAPPY)
+    async def _flush_loop(self) -> None:
+        """Flushes buffered writes every FLUSH_INTERVAL seconds until the buffer stays empty."""
+        while self._dirty or self._pending_interactions or self._retry_interactions:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            await self.flush()
+            
+    async def flush(self) -> None:
+        """Writes all buffered stat changes and interaction logs to the database."""
+        # _flush_loop and update_all both flush; overlapping flushes could write a
+        # pet's snapshots out of order, or requeue a stale one after a newer write
+        async with self._flush_lock:
+            await self._flush()
+            
+    async def _flush(self) -> None:
+        """Writes the buffer out; caller must hold self._flush_lock."""
+        if not self._dirty and not self._pending_interactions and not self._retry_interactions:
+            return
+            
+        items = list(self._dirty.items())
+        retry = self._retry_interactions
+        interactions = [row for row, _ in retry] + self._pending_interactions
+        self._dirty = {}
+        self._pending_interactions = []
+        self._retry_interactions = []
+        
+        # Failed batches go back into the buffer for the next flush, until a row has
+        # failed MAX_FLUSH_ATTEMPTS times; a row that can never be written (a deleted
+        # pet, bad data) would otherwise block every later batch
+        if await self._write_batch(update_pet_stats_many, items):
+            for pet_id, _ in items:
+                self._stat_attempts.pop(pet_id, None)
+        else:
+            dropped = []
+            for pet_id, stats in items:
+                attempts = self._stat_attempts.get(pet_id, 0) + 1
+                if attempts >= self.MAX_FLUSH_ATTEMPTS:
+                    del self._stat_attempts[pet_id]
+                    dropped.append(pet_id)
+                    continue
+                self._stat_attempts[pet_id] = attempts
+                # A snapshot buffered since the swap is newer; keep it
+                self._dirty.setdefault(pet_id, stats)
+            logger.error(f"Failed to persist stats for {len(items)} pets, retrying next flush")
+            if dropped:
+                logger.error(f"Dropped stats for pets {dropped} after {self.MAX_FLUSH_ATTEMPTS} attempts")
+            
+        if not await self._write_batch(log_interactions_many, interactions):
+            attempts = [count for _, count in retry] + [0] * (len(interactions) - len(retry))
+            dropped = []
+            for row, count in zip(interactions, attempts):
+                if count + 1 >= self.MAX_FLUSH_ATTEMPTS:
+                    dropped.append(row)
                 else:
-                    await self.set_state(PetStatus.NORMAL)
-                
-                self.last_update = now
-class PetStateManager:
-    """Manages pet states and handles stat calculations."""
-    def __init__(self):
-        self._pet_states = {}
-        self._lock = asyncio.Lock()
-        self._operation_counter = AtomicCounter()
+                    self._retry_interactions.append((row, count + 1))
+            logger.error(f"Failed to log {len(interactions)} interactions, retrying next flush")
+            if dropped:
+                logger.error(f"Dropped interactions after {self.MAX_FLUSH_ATTEMPTS} attempts: {dropped}")
+            
+    @staticmethod
+    async def _write_batch(write: Callable[[list], bool], rows: list) -> bool:
+        """
+        Runs one bulk database write in a worker thread.
         
-    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-        """Get or create a pet state for the given pet ID."""
+        Args:
+            write: Bulk write function taking the rows
+            rows: Rows to write
+            
+        Returns:
+            bool: True if the rows were written
+        """
         try:
-            async with self._lock:
-                if pet_id not in self._pet_states:
-                    # Load pet data from database
-                    pet_data = get_pet_stats(pet_id)
-                    if not pet_data:
-                        logger.error(f"Failed to load stats for pet {pet_id}")
-                        return None
-                    
-                    # Create new pet state
-                    self._pet_states[pet_id] = PetState(
-                        pet_id=pet_id,
-                        name=pet_data['name'],
-                        species=pet_data['species'],
-                        stats=pet_data['stats']
-                    )
-                
-                return self._pet_states[pet_id]
-                
+            return await asyncio.to_thread(write, rows)
         except Exception as e:
-            logger.error(f"Error getting pet state: {e}")
+            logger.error(f"Error flushing pet states: {e}")
             logger.error(traceback.format_exc())
-            return None
-        if pet_id not in self.states:
-            # Load initial stats from database or use defaults
-            initial_stats = await self.load_pet_stats(pet_id)
-            self.states[pet_id] = PetState(pet_id, initial_stats)
-        return self.states[pet_id]
+            return False
         
-    async def load_pet_stats(self, pet_id: int):
-        """Load pet stats from database"""
-        # Implement database loading logic here
-        # For now, return default stats
-        return {
-            'hunger': 100,
-            'happiness': 100,
-            'energy': 100,
-            'hygiene': 100
-        }
-
-@dataclass
-class InteractionEffect:
-    """Defines the effects and requirements of a pet interaction."""
-    happiness: int
-    hunger: int
-    energy: int
-    hygiene: int
-    cooldown: timedelta
-    conditions: Dict[str, Any]
-    """Thread-safe counter for tracking atomic operations."""
-    def __init__(self):
-        self._value = 0
-        self._lock = asyncio.Lock()
-    
-    async def increment(self) -> int:
-        async with self._lock:
-            self._value += 1
-            return self._value
-    
-    async def get_value(self) -> int:
-        async with self._lock:
-            return self._value
-        class PetStateManager:
-            """Manages individual pet state and handles stat calculations."""
-            def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                """
-                Initialize pet state manager.
-                
-                Args:
-                    pet_id: Unique identifier for the pet
-                    initial_stats: Dictionary containing pet's initial stats
-                """
-                self.pet_id = pet_id
-                self.name = initial_stats['name']
-                self.species = initial_stats['species']
-                self.stats = initial_stats['stats'].copy()
-                self._state = PetState.NORMAL  # Private state variable
-                self._state_lock = asyncio.Lock()  # Lock for state transitions
-                self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                self.last_update = initial_stats['last_update']
-                self.interaction_history: Dict[InteractionType, datetime] = {}
-                self.treat_count = 0
-                self.last_treat_reset = datetime.now(timezone.utc)
-                self._operation_counter = AtomicCounter()
-                self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                self._last_verified_state: Optional[Dict[str, Any]] = None
-                self._last_persistence_time = datetime.now(timezone.utc)
-                self._lock = asyncio.Lock()  # Add lock attribute
-                def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                    """
-                    Initialize pet state manager.
-                    
-                    Args:
-                        pet_id: Unique identifier for the pet
-                        initial_stats: Dictionary containing pet's initial stats
-                    """
-                    self.pet_id = pet_id
-                    self.name = initial_stats['name']
-                    self.species = initial_stats['species']
-                    self.stats = initial_stats['stats'].copy()
-                    self._state = PetState.NORMAL  # Private state variable
-                    self._state_lock = asyncio.Lock()  # Lock for state transitions
-                    self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                    self.last_update = initial_stats['last_update']
-                    self.interaction_history: Dict[InteractionType, datetime] = {}
-                    self.treat_count = 0
-                    self.last_treat_reset = datetime.now(timezone.utc)
-                    self._operation_counter = AtomicCounter()
-                    self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                    self._last_verified_state: Optional[Dict[str, Any]] = None
-                    self._last_persistence_time = datetime.now(timezone.utc)
-                    self._lock = asyncio.Lock()  # Add lock attribute
-                    class PetStateManager:
-                        """Initialize the pet state manager."""
-                        self._pet_states = {}
-                        self._lock = asyncio.Lock()
-                    
-                    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-                        """Get or create a pet state for the given pet ID."""
-                        try:
-                            async with self._lock:
-                                if pet_id not in self._pet_states:
-                                    # Load pet data from database
-                                    pet_data = get_pet_stats(pet_id)
-                                    if not pet_data:
-                                        logger.error(f"Failed to load stats for pet {pet_id}")
-                                        return None
-                                    
-                                    # Create new pet state
-                                    self._pet_states[pet_id] = PetState(
-                                        pet_id=pet_id,
-                                        name=pet_data['name'],
-                                        species=pet_data['species'],
-                                        stats=pet_data['stats']
-                                    )
-                                
-                                return self._pet_states[pet_id]
-                                
-                        except Exception as e:
-                            logger.error(f"Error getting pet state: {e}")
-                            logger.error(traceback.format_exc())
-class PetState:
-    def __init__(self, pet_id: int, name: str, species: str, stats: Dict[str, int]):
-        """Initialize pet state."""
-        self.pet_id = pet_id
-        self.name = name
-        self.species = species
-        self.stats = stats
-        self._state = PetStatus.NORMAL  # Update to use PetStatus enum
-        self._lock = asyncio.Lock()
-        self.last_update = datetime.now(timezone.utc)
-        self.interaction_history = {}
-    @property
-    def state(self) -> PetStatus:
-        """Get current pet state."""
-        return self._state
-    async def set_state(self, new_state: PetStatus) -> None:
-        """Thread-safe setter for pet state."""
-        async with self._lock:
-            self._state = new_state
-    async def update(self) -> None:
-        """Update pet stats based on time elapsed."""
-        async with self._lock:
-            now = datetime.now(timezone.utc)
-            time_elapsed = (now - self.last_update).total_seconds()
+    async def remove_pet(self, pet_id: int) -> None:
+        """
+        Evicts a pet from the cache.
+        
+        Args:
+            pet_id: ID of the pet to evict
+        """
+        self._pet_states.pop(pet_id, None)
             
-            # Update stats based on time elapsed (every hour)
-            hours_elapsed = time_elapsed / 3600
-            if hours_elapsed >= 1:
-                # Decrease stats over time
-                self.stats['hunger'] = max(0, self.stats['hunger'] - int(5 * hours_elapsed))
-                self.stats['energy'] = max(0, self.stats['energy'] - int(3 * hours_elapsed))
-                self.stats['hygiene'] = max(0, self.stats['hygiene'] - int(4 * hours_elapsed))
-                self.stats['happiness'] = max(0, self.stats['happiness'] - int(2 * hours_elapsed))
-                
-                # Update state based on stats
-                if self.stats['hygiene'] < 30:
-                    await self.set_state(PetStatus.SICK)
-                elif self.stats['happiness'] < 30:
-                    await self.set_state(PetStatus.UNHAPPY)
-                else:
-                    await self.set_state(PetStatus.NORMAL)
-                
-                self.last_update = now
-class PetStateManager:
-    """Manages pet states and handles stat calculations."""
-    def __init__(self):
-        self._pet_states = {}
-        self._lock = asyncio.Lock()
-        self._operation_counter = AtomicCounter()
+    async def warmup(self, pet_ids: List[int]) -> None:
+        """
+        Loads the given pets into the cache with a single bulk query.
         
-    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-        """Get or create a pet state for the given pet ID."""
+        Args:
+            pet_ids: IDs of the pets to preload
+        """
+        pet_ids = [pet_id for pet_id in pet_ids if pet_id not in self._pet_states]
+        if not pet_ids:
+            return
+            
         try:
-            async with self._lock:
-                if pet_id not in self._pet_states:
-                    # Load pet data from database
-                    pet_data = get_pet_stats(pet_id)
-                    if not pet_data:
-                        logger.error(f"Failed to load stats for pet {pet_id}")
-                        return None
+            pets_data = await asyncio.to_thread(get_pet_stats_many, pet_ids)
+            
+            for pet_id, pet_data in pets_data.items():
+                if pet_id in self._pet_states:
+                    continue
+                self._pet_states[pet_id] = self._new_pet_state(pet_id, pet_data)
                     
-                    # Create new pet state
-                    self._pet_states[pet_id] = PetState(
-                        pet_id=pet_id,
-                        name=pet_data['name'],
-                        species=pet_data['species'],
-                        stats=pet_data['stats']
-                    )
-                
-                return self._pet_states[pet_id]
-                
+            logger.info(f"Preloaded {len(pets_data)} of {len(pet_ids)} pet states")
+            
         except Exception as e:
-            logger.error(f"Error getting pet state: {e}")
+            logger.error(f"Error preloading pet states: {e}")
             logger.error(traceback.format_exc())
-            return None
-        if pet_id not in self.states:
-            # Load initial stats from database or use defaults
-            initial_stats = await self.load_pet_stats(pet_id)
-            self.states[pet_id] = PetState(pet_id, initial_stats)
-        return self.states[pet_id]
-        
-    async def load_pet_stats(self, pet_id: int):
-        """Load pet stats from database"""
-        # Implement database loading logic here
-        # For now, return default stats
-        return {
-            'hunger': 100,
-            'happiness': 100,
-            'energy': 100,
-            'hygiene': 100
-        }
-
-@dataclass
-class InteractionEffect:
-    """Defines the effects and requirements of a pet interaction."""
-    happiness: int
-    hunger: int
-    energy: int
-    hygiene: int
-    cooldown: timedelta
-    conditions: Dict[str, Any]
-    """Thread-safe counter for tracking atomic operations."""
-    def __init__(self):
-        self._value = 0
-        self._lock = asyncio.Lock()
-    
-    async def increment(self) -> int:
-        async with self._lock:
-            self._value += 1
-            return self._value
-    
-    async def get_value(self) -> int:
-        async with self._lock:
-            return self._value
-        class PetStateManager:
-            """Manages individual pet state and handles stat calculations."""
-            def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                """
-                Initialize pet state manager.
-                
-                Args:
-                    pet_id: Unique identifier for the pet
-                    initial_stats: Dictionary containing pet's initial stats
-                """
-                self.pet_id = pet_id
-                self.name = initial_stats['name']
-                self.species = initial_stats['species']
-                self.stats = initial_stats['stats'].copy()
-                self._state = PetState.NORMAL  # Private state variable
-                self._state_lock = asyncio.Lock()  # Lock for state transitions
-                self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                self.last_update = initial_stats['last_update']
-                self.interaction_history: Dict[InteractionType, datetime] = {}
-                self.treat_count = 0
-                self.last_treat_reset = datetime.now(timezone.utc)
-                self._operation_counter = AtomicCounter()
-                self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                self._last_verified_state: Optional[Dict[str, Any]] = None
-                self._last_persistence_time = datetime.now(timezone.utc)
-                self._lock = asyncio.Lock()  # Add lock attribute
-                def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                    """
-                    Initialize pet state manager.
-                    
-                    Args:
-                        pet_id: Unique identifier for the pet
-                        initial_stats: Dictionary containing pet's initial stats
-                    """
-                    self.pet_id = pet_id
-                    self.name = initial_stats['name']
-                    self.species = initial_stats['species']
-                    self.stats = initial_stats['stats'].copy()
-                    self._state = PetState.NORMAL  # Private state variable
-                    self._state_lock = asyncio.Lock()  # Lock for state transitions
-                    self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                    self.last_update = initial_stats['last_update']
-                    self.interaction_history: Dict[InteractionType, datetime] = {}
-                    self.treat_count = 0
-                    self.last_treat_reset = datetime.now(timezone.utc)
-                    self._operation_counter = AtomicCounter()
-                    self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                    self._last_verified_state: Optional[Dict[str, Any]] = None
-                    self._last_persistence_time = datetime.now(timezone.utc)
-                    self._lock = asyncio.Lock()  # Add lock attribute
-                    class PetStateManager:
-                        """Initialize the pet state manager."""
-                        self._pet_states = {}
-                        self._lock = asyncio.Lock()
-                    
-                    async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
-                        """Get or create a pet state for the given pet ID."""
-                        try:
-                            async with self._lock:
-                                if pet_id not in self._pet_states:
-                                    # Load pet data from database
-                                    pet_data = get_pet_stats(pet_id)
-                                    if not pet_data:
-                                        logger.error(f"Failed to load stats for pet {pet_id}")
-                                        return None
-                                    
-                                    # Create new pet state
-                                    self._pet_states[pet_id] = PetState(
-                                        pet_id=pet_id,
-                                        name=pet_data['name'],
-                                        species=pet_data['species'],
-                                        stats=pet_data['stats']
-                                    )
-                                
-                                return self._pet_states[pet_id]
-                                
-                        except Exception as e:
-                            logger.error(f"Error getting pet state: {e}")
-                            logger.error(traceback.format_exc())
-class PetState:
-    def __init__(self, pet_id: int, name: str, species: str, stats: Dict[str, int]):
-        """Initialize pet state."""
-        self.pet_id = pet_id
-        self.name = name
-        self.species = species
-        self.stats = stats
-        self._state = PetStatus.NORMAL  # Update to use PetStatus enum
-        self._lock = asyncio.Lock()
-        self.last_update = datetime.now(timezone.utc)
-        self.interaction_history = {}
-    @property
-    def state(self) -> PetStatus:
-        """Get current pet state."""
-        return self._state
-    async def set_state(self, new_state: PetStatus) -> None:
-        """Thread-safe setter for pet state."""
-        async with self._lock:
-            self._state = new_state
-    async def update(self) -> None:
-        """Update pet stats based on time elapsed."""
-        async with self._lock:
-            now = datetime.now(timezone.utc)
-            time_elapsed = (now - self.last_update).total_seconds()
             
-            # Update stats based on time elapsed (every hour)
-            hours_elapsed = time_elapsed / 3600
-            if hours_elapsed >= 1:
-                # Decrease stats over time
-                self.stats['hunger'] = max(0, self.stats['hunger'] - int(5 * hours_elapsed))
-                self.stats['energy'] = max(0, self.stats['energy'] - int(3 * hours_elapsed))
-                self.stats['hygiene'] = max(0, self.stats['hygiene'] - int(4 * hours_elapsed))
-                self.stats['happiness'] = max(0, self.stats['happiness'] - int(2 * hours_elapsed))
-                
-                # Update state based on stats
-                if self.stats['hygiene'] < 30:
-                    await self.set_state(PetStatus.SICK)
-                elif self.stats['happiness'] < 30:
-                    await self.set_state(PetStatus.UNHAPPY)
-                else:
-                    await self.set_state(PetStatus.NORMAL)
-                
-                self.last_update = now
-class PetStateManager:
-    """Manages pet states and handles stat calculations."""
-    def __init__(self):
-        self._pet_states = {}
-        self._lock = asyncio.Lock()
-        self._operation_counter = AtomicCounter()
+    async def update_all(self) -> None:
+        """Persists the current (decayed) stats of every cached pet and drains the write buffer."""
+        # PetState.stats is computed on read and returns a fresh dict
+        for pet_state in self._pet_states.values():
+            self._dirty[pet_state.pet_id] = pet_state.stats
+        await self.flush()
         
     async def get_pet_state(self, pet_id: int) -> Optional[PetState]:
         """Get or create a pet state for the given pet ID."""
+        # The cache is only touched from the event loop and never across an await,
+        # so both the lookup and the insert below are atomic without a lock.
+        pet_state = self._pet_states.get(pet_id)
+        if pet_state is not None:
+            return pet_state
+            
+        # Another coroutine is already loading this pet; share its result instead
+        # of issuing a duplicate query
+        loading = self._loading.get(pet_id)
+        if loading is not None:
+            return await asyncio.shield(loading)
+            
+        loading = asyncio.get_running_loop().create_future()
+        self._loading[pet_id] = loading
+        pet_state = None
         try:
-            async with self._lock:
-                if pet_id not in self._pet_states:
-                    # Load pet data from database
-                    pet_data = get_pet_stats(pet_id)
-                    if not pet_data:
-                        logger.error(f"Failed to load stats for pet {pet_id}")
-                        return None
-                    
-                    # Create new pet state
-                    self._pet_states[pet_id] = PetState(
-                        pet_id=pet_id,
-                        name=pet_data['name'],
-                        species=pet_data['species'],
-                        stats=pet_data['stats']
-                    )
-                
-                return self._pet_states[pet_id]
+            # Batched with any other misses in the same few milliseconds
+            pet_data = await self._loader.load(pet_id)
+            if not pet_data:
+                logger.error(f"Failed to load stats for pet {pet_id}")
+                return None
+                
+            # warmup() may have inserted this pet while the query was running
+            pet_state = self._pet_states.get(pet_id)
+            if pet_state is None:
+                pet_state = self._new_pet_state(pet_id, pet_data)
+                self._pet_states[pet_id] = pet_state
+            return pet_state
                 
         except Exception as e:
             logger.error(f"Error getting pet state: {e}")
             logger.error(traceback.format_exc())
             return None
-        if pet_id not in self.states:
-            # Load initial stats from database or use defaults
-            initial_stats = await self.load_pet_stats(pet_id)
-            self.states[pet_id] = PetState(pet_id, initial_stats)
-        return self.states[pet_id]
-        
-    async def load_pet_stats(self, pet_id: int):
-        """Load pet stats from database"""
-        # Implement database loading logic here
-        # For now, return default stats
-        return {
-            'hunger': 100,
-            'happiness': 100,
-            'energy': 100,
-            'hygiene': 100
-        }
-
-@dataclass
-class InteractionEffect:
-    """Defines the effects and requirements of a pet interaction."""
-    happiness: int
-    hunger: int
-    energy: int
-    hygiene: int
-    cooldown: timedelta
-    conditions: Dict[str, Any]
-    """Thread-safe counter for tracking atomic operations."""
-    def __init__(self):
-        self._value = 0
-        self._lock = asyncio.Lock()
-    
-    async def increment(self) -> int:
-        async with self._lock:
-            self._value += 1
-            return self._value
-    
-    async def get_value(self) -> int:
-        async with self._lock:
-            return self._value
-        class PetStateManager:
-            """Manages individual pet state and handles stat calculations."""
-            def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                """
-                Initialize pet state manager.
-                
-                Args:
-                    pet_id: Unique identifier for the pet
-                    initial_stats: Dictionary containing pet's initial stats
-                """
-                self.pet_id = pet_id
-                self.name = initial_stats['name']
-                self.species = initial_stats['species']
-                self.stats = initial_stats['stats'].copy()
-                self._state = PetState.NORMAL  # Private state variable
-                self._state_lock = asyncio.Lock()  # Lock for state transitions
-                self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                self.last_update = initial_stats['last_update']
-                self.interaction_history: Dict[InteractionType, datetime] = {}
-                self.treat_count = 0
-                self.last_treat_reset = datetime.now(timezone.utc)
-                self._operation_counter = AtomicCounter()
-                self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                self._last_verified_state: Optional[Dict[str, Any]] = None
-                self._last_persistence_time = datetime.now(timezone.utc)
-                self._lock = asyncio.Lock()  # Add lock attribute
-                def __init__(self, pet_id: int, initial_stats: Dict[str, Any]):
-                    """
-                    Initialize pet state manager.
-                    
-                    Args:
-                        pet_id: Unique identifier for the pet
-                        initial_stats: Dictionary containing pet's initial stats
-                    """
-                    self.pet_id = pet_id
-                    self.name = initial_stats['name']
-                    self.species = initial_stats['species']
-                    self.stats = initial_stats['stats'].copy()
-                    self._state = PetState.NORMAL  # Private state variable
-                    self._state_lock = asyncio.Lock()  # Lock for state transitions
-                    self._stats_lock = asyncio.Lock()  # Lock for stats modifications
-                    self.last_update = initial_stats['last_update']
-                    self.interaction_history: Dict[InteractionType, datetime] = {}
-                    self.treat_count = 0
-                    self.last_treat_reset = datetime.now(timezone.utc)
-                    self._operation_counter = AtomicCounter()
-                    self._pending_changes: Dict[int, Dict[str, Any]] = {}
-                    self._last_verified_state: Optional[Dict[str, Any]] = None
\ No newline at end of file
+        finally:
+            del self._loading[pet_id]
+            loading.set_result(pet_state)
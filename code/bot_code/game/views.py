@@ -1,12 +1,15 @@
 from __future__ import annotations
 import asyncio
+import functools
 import logging
-from typing import Optional, Dict, List, Tuple
+import time
+from collections import deque
+from typing import Optional, Deque, Dict, List, Tuple
 from datetime import datetime, timezone
-import traceback
+import weakref
 
 import nextcord as discord
-from nextcord.ext import commands, tasks
+from nextcord.ext import commands
 from nextcord import ButtonStyle
 from nextcord.ui import Button, View
 
@@ -14,7 +17,7 @@ from utils.sprite_handler import SpriteHandler
 
 from .state import (
     PetStateManager, PetState, PetStatus, InteractionType, InteractionEffect,
-    INTERACTION_EFFECTS
+    INTERACTION_EFFECTS_TABLE
 )
 
 # Configure logging
@@ -27,7 +30,56 @@ STATE_COLORS = {
     PetStatus.SICK: discord.Color.red(),
     PetStatus.UNHAPPY: discord.Color.gold()
 }
-def create_progress_bar(value: int, max_value: int = 100, length: int = 10) -> str:
+
+# Icons shown next to each stat in the status embed
+STAT_ICONS = {
+    'happiness': '❤️',
+    'hunger': '🍖',
+    'energy': '⚡',
+    'hygiene': '✨'
+}
+
+# (interaction, button style, button row) in display order
+BUTTON_LAYOUT: Tuple[Tuple[InteractionType, ButtonStyle, int], ...] = (
+    (InteractionType.FEED, ButtonStyle.green, 0),
+    (InteractionType.CLEAN, ButtonStyle.blurple, 0),
+    (InteractionType.SLEEP, ButtonStyle.gray, 1),
+    (InteractionType.WAKE, ButtonStyle.blurple, 1),
+    (InteractionType.PLAY, ButtonStyle.green, 2),
+    (InteractionType.PET, ButtonStyle.gray, 2),
+    (InteractionType.EXERCISE, ButtonStyle.red, 3),
+    (InteractionType.TREAT, ButtonStyle.green, 3),
+    (InteractionType.MEDICINE, ButtonStyle.red, 4)
+)
+
+def _status_allows(conditions: Dict[str, object], status: PetStatus) -> bool:
+    """Checks an interaction's status conditions against a pet status."""
+    if conditions.get("not_sleeping") and status == PetStatus.SLEEPING:
+        return False
+    if conditions.get("is_sleeping") and status != PetStatus.SLEEPING:
+        return False
+    if conditions.get("is_sick") and status != PetStatus.SICK:
+        return False
+    return True
+
+# Buttons worth showing in each status; interactions the status rules out are hidden
+BUTTONS_BY_STATE: Dict[PetStatus, Tuple[Tuple[InteractionType, ButtonStyle, int], ...]] = {
+    status: tuple(
+        entry for entry in BUTTON_LAYOUT
+        if _status_allows(INTERACTION_EFFECTS_TABLE[entry[0]].conditions, status)
+    )
+    for status in PetStatus
+}
+
+# Every bar of the default length, indexed by the number of filled cells
+PROGRESS_BAR_LENGTH = 10
+_PROGRESS_BARS = tuple(
+    '█' * filled + '░' * (PROGRESS_BAR_LENGTH - filled)
+    for filled in range(PROGRESS_BAR_LENGTH + 1)
+)
+
+@functools.lru_cache(maxsize=1024)
+def create_progress_bar(value: int, max_value: int = 100, length: int = PROGRESS_BAR_LENGTH) -> str:
     """
     Creates a visual progress bar for stats.
     
@@ -40,8 +92,10 @@ def create_progress_bar(value: int, max_value: int = 100, length: int = 10) -> s
         String representation of progress bar with value
     """
     filled = int((value / max_value) * length)
-    empty = length - filled
-    bar = '█' * filled + '░' * empty
+    if length == PROGRESS_BAR_LENGTH and 0 <= filled <= length:
+        bar = _PROGRESS_BARS[filled]
+    else:
+        bar = '█' * filled + '░' * (length - filled)
     return f"{bar} {value}%"
 
 async def get_pet_image(pet_state: PetStateManager) -> str:
@@ -57,7 +111,7 @@ async def get_pet_image(pet_state: PetStateManager) -> str:
     # Base image path format: assets/{species}_{state}.png
     base_path = f"assets/{pet_state.species.lower()}/{pet_state.species.lower()}"
     current_state = pet_state.state
-    return f"{base_path}-{current_state.value}.png"
+    return f"{base_path}-{current_state.name.lower()}.png"
 
 def format_cooldown(seconds: float) -> str:
     """
@@ -69,15 +123,75 @@ def format_cooldown(seconds: float) -> str:
     Returns:
         Formatted string (e.g., "2h 30m" or "45s")
     """
-    if seconds < 60:
-        return f"{int(seconds)}s"
-    elif seconds < 3600:
-        minutes = int(seconds / 60)
-        return f"{minutes}m"
-    else:
-        hours = int(seconds / 3600)
-        minutes = int((seconds % 3600) / 60)
-        return f"{hours}h {minutes}m"
+    total = int(seconds)
+    if total < 60:
+        return f"{total}s"
+    hours, remainder = divmod(total, 3600)
+    minutes = remainder // 60
+    return f"{hours}h {minutes}m" if hours else f"{minutes}m"
+
+class EditScheduler:
+    """
+    Sends periodic message edits at a rate each channel's bucket can absorb.
+    
+    Only the latest pending edit per message is kept, so a message that is queued
+    again before its turn is edited once with the newest embed.
+    """
+    CHANNEL_EDITS = 4  # Edits allowed per channel in each CHANNEL_WINDOW
+    CHANNEL_WINDOW = 5.0  # Seconds
+    
+    def __init__(self):
+        self._pending: Dict[int, Dict[int, Tuple[discord.Message, PetView]]] = {}  # channel_id -> message_id -> edit
+        self._sent: Dict[int, Deque[float]] = {}  # channel_id -> monotonic times of recent edits
+        self._workers: Dict[int, asyncio.Task] = {}
+        
+    def submit(self, message: discord.Message, view: PetView) -> None:
+        """
+        Queues an edit, replacing any edit still pending for the same message.
+        
+        Args:
+            message: Message to edit
+            view: View to attach; its newest embed is sent when the edit goes out
+        """
+        channel_id = message.channel.id
+        self._pending.setdefault(channel_id, {})[message.id] = (message, view)
+        worker = self._workers.get(channel_id)
+        if worker is None or worker.done():
+            self._workers[channel_id] = asyncio.get_running_loop().create_task(
+                self._drain(channel_id)
+            )
+            
+    async def _drain(self, channel_id: int) -> None:
+        """Sends a channel's pending edits oldest first, waiting whenever its bucket is spent."""
+        pending = self._pending[channel_id]
+        sent = self._sent.setdefault(channel_id, deque())
+        while pending:
+            now = time.monotonic()
+            while sent and now - sent[0] >= self.CHANNEL_WINDOW:
+                sent.popleft()
+            if len(sent) >= self.CHANNEL_EDITS:
+                await asyncio.sleep(self.CHANNEL_WINDOW - (now - sent[0]))
+                continue
+                
+            message, view = pending.pop(next(iter(pending)))
+            sent.append(now)
+            try:
+                await view.send_latest(message.edit)
+            except (discord.NotFound, discord.Forbidden) as e:
+                # Deleted or no longer editable; later edits would fail the same way
+                logger.warning(f"Detaching view from message {message.id}: {e}")
+                view.detach()
+            except Exception as e:
+                logger.exception(f"Error editing message {message.id}: {e}")
+                
+        del self._pending[channel_id]
+        del self._workers[channel_id]
+
+# Shared by every PetView so edits to the same channel are paced together
+edit_scheduler = EditScheduler()
+
+# Sprite lookups don't depend on the view, so all views share one handler
+sprite_handler = SpriteHandler()
 
 class InteractionButton(Button):
     """Button for pet interactions with cooldown and state management."""
@@ -85,19 +199,21 @@ class InteractionButton(Button):
         self,
         interaction_type: InteractionType,
         style: ButtonStyle,
+        row: int,
         pet_view: 'PetView'  # Forward reference for type hint
     ):
         self.interaction_type = interaction_type
         self.pet_view = pet_view
-        self.effect = INTERACTION_EFFECTS[interaction_type]
+        self.effect = INTERACTION_EFFECTS_TABLE[interaction_type]
         
         # Add unique identifier using pet_id to prevent duplicates
-        custom_id = f"pet_interaction_{interaction_type.value}_{pet_view.pet_state.pet_id}"
+        custom_id = f"pet_interaction_{interaction_type.name.lower()}_{pet_view.pet_state.pet_id}"
         
         super().__init__(
             style=style,
-            label=interaction_type.value.title(),
-            custom_id=custom_id
+            label=interaction_type.name.title(),
+            custom_id=custom_id,
+            row=row
         )
 
     async def callback(self, interaction: discord.Interaction):
@@ -108,34 +224,28 @@ class InteractionButton(Button):
             )
             
             if success:
-                await self.pet_view.update_display(interaction)
-                await interaction.followup.send(f"✅ {message}", ephemeral=True)
+                # The redrawn embed confirms the action, so no separate followup
+                self.pet_view.last_action = self.interaction_type
+                self.pet_view.schedule_display_update(interaction)
             else:
                 await interaction.followup.send(f"❌ {message}", ephemeral=True)
         except Exception as e:
-            logger.error(f"Error processing interaction {self.interaction_type}: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error processing interaction {self.interaction_type}: {e}")
             await interaction.followup.send(
                 "❌ An error occurred processing your interaction!",
                 ephemeral=True
             )
-    def _get_button_row(self) -> int:
-        """Determines button row based on interaction type."""
-        interaction_rows = {
-            InteractionType.FEED: 0,
-            InteractionType.CLEAN: 0,
-            InteractionType.SLEEP: 1,
-            InteractionType.WAKE: 1,
-            InteractionType.PLAY: 2,
-            InteractionType.PET: 2,
-            InteractionType.EXERCISE: 3,
-            InteractionType.TREAT: 3,
-            InteractionType.MEDICINE: 4
-        }
-        return interaction_rows.get(self.interaction_type, 0)
 
 class PetView(View):
     """Main view for pet display and interactions."""
+    REFRESH_INTERVAL = 15  # Seconds between periodic display refreshes
+    SLEEPING_REFRESH_INTERVAL = 60  # Sleeping pets change slowly; refresh them less often
+    REFRESH_BATCH_SIZE = 10  # Views refreshed concurrently per slice of the interval
+    CLICK_DEBOUNCE = 0.5  # Seconds of button clicks collapsed into one display edit
+    
+    # Every live view is refreshed by one shared task instead of a timer per view
+    _active_views: "weakref.WeakSet[PetView]" = weakref.WeakSet()
+    _refresh_task: Optional[asyncio.Task] = None
     
     def __init__(self, pet_state: PetStateManager, bot: commands.Bot):
         """
@@ -148,33 +258,35 @@ class PetView(View):
         super().__init__(timeout=None)
         self.pet_state = pet_state
         self.bot = bot
-        self.sprite_handler = SpriteHandler()
+        self.sprite_handler = sprite_handler
         self.message: Optional[discord.Message] = None
-        self._lock = asyncio.Lock()
+        self._generation = 0  # Bumped per update_display call; older calls stand down
+        self._send_lock = asyncio.Lock()  # Serializes message edits so they land in order
+        self._last_refresh = float('-inf')  # Monotonic time of the last periodic refresh
+        self._button_state: Optional[PetStatus] = None  # Status the current buttons were built for
+        self.last_action: Optional[InteractionType] = None  # Latest successful interaction, shown in the embed
+        self._render_cache_key: Optional[tuple] = None  # Visible content of the last sent embed
+        self._embed: Optional[discord.Embed] = None  # Last embed built, reused while the key matches
+        self._pending_interaction: Optional[discord.Interaction] = None  # Latest click awaiting a redraw
+        self._debounce_task: Optional[asyncio.Task] = None
         self.setup_buttons()
-        self.start_update_loop()
+        self.register()
 
     def setup_buttons(self):
-        """Set up interaction buttons."""
-        button_styles = {
-            InteractionType.FEED: ButtonStyle.green,
-            InteractionType.CLEAN: ButtonStyle.blurple,
-            InteractionType.SLEEP: ButtonStyle.gray,
-            InteractionType.WAKE: ButtonStyle.blurple,
-            InteractionType.PLAY: ButtonStyle.green,
-            InteractionType.PET: ButtonStyle.gray,
-            InteractionType.EXERCISE: ButtonStyle.red,
-            InteractionType.TREAT: ButtonStyle.green,
-            InteractionType.MEDICINE: ButtonStyle.red
-        }
-        
-        for interaction_type, style in button_styles.items():
-            button = InteractionButton(
+        """Set up the interaction buttons for the pet's current status, if it changed."""
+        state = self.pet_state.state
+        if state == self._button_state:
+            return
+            
+        self.clear_items()
+        self._button_state = state
+        for interaction_type, style, row in BUTTONS_BY_STATE[state]:
+            self.add_item(InteractionButton(
                 interaction_type=interaction_type,
                 style=style,
+                row=row,
                 pet_view=self
-            )
-            self.add_item(button)
+            ))
     def _get_active_effects(self) -> List[str]:
         """
         Gets list of active effects on the pet.
@@ -185,31 +297,40 @@ class PetView(View):
         active_effects = []
         
         # Add status-based effects
-        if self.pet_state.state == PetStatus.SLEEPING:
+        current_state = self.pet_state.state
+        if current_state == PetStatus.SLEEPING:
             active_effects.append("💤 Sleeping - Energy recovery increased")
-        elif self.pet_state.state == PetStatus.SICK:
+        elif current_state == PetStatus.SICK:
             active_effects.append("🤒 Sick - Stats decay faster")
-        elif self.pet_state.state == PetStatus.UNHAPPY:
+        elif current_state == PetStatus.UNHAPPY:
             active_effects.append("😢 Unhappy - Needs attention")
             
         return active_effects
-    async def create_status_embed(self) -> discord.Embed:
-        """Creates pet status embed with current stats."""
+    async def create_status_embed(self, now: Optional[datetime] = None) -> discord.Embed:
+        """
+        Creates pet status embed with current stats.
+        
+        Args:
+            now: Current UTC time, if the caller already has it
+        """
         try:
+            if now is None:
+                now = datetime.now(timezone.utc)
+                
             # Get current state
             current_state = self.pet_state.state
             
             # Get sprite URL
             sprite_url = await self.sprite_handler.get_sprite_url(
                 self.pet_state.species,
-                self.pet_state.state
+                current_state
             )
             
             embed = discord.Embed(
                 title=f"{self.pet_state.name} the {self.pet_state.species}",
                 description="Your virtual pet!",
                 color=STATE_COLORS[current_state],
-                timestamp=datetime.now(timezone.utc)
+                timestamp=now
             )
             
             # Set the sprite as the embed's image
@@ -217,35 +338,32 @@ class PetView(View):
                 embed.set_image(url=sprite_url)
             
             # Add status field
-            time_ago = format_cooldown(
-                (datetime.now(timezone.utc) - self.pet_state.last_update)
-                .total_seconds()
+            time_ago = format_cooldown((now - self.pet_state.last_update).total_seconds())
+            status_text = (
+                f"Currently: {current_state.name.lower()}\n"
+                f"Last interaction: {time_ago} ago"
             )
+            if self.last_action is not None:
+                status_text += f"\nLast action: ✅ {self.last_action.name.title()}"
             
             embed.add_field(
                 name="Status",
-                value=f"Currently: {current_state.value}\n"
-                      f"Last interaction: {time_ago} ago",
+                value=status_text,
                 inline=False
             )
             
-            # Add stats with progress bars
-            stats_text = []
-            for stat, value in self.pet_state.stats.items():
-                icon = {
-                    'happiness': '❤️',
-                    'hunger': '🍖',
-                    'energy': '⚡',
-                    'hygiene': '✨'
-                }.get(stat, '📊')
-                
-                stats_text.append(
-                    f"{icon} {stat.title()}: {create_progress_bar(value)}"
-                )
+            # Add stats with progress bars; the stat set is fixed, so format it in one go
+            stats = self.pet_state.stats
+            stats_text = (
+                f"{STAT_ICONS['happiness']} Happiness: {create_progress_bar(stats['happiness'])}\n"
+                f"{STAT_ICONS['hunger']} Hunger: {create_progress_bar(stats['hunger'])}\n"
+                f"{STAT_ICONS['energy']} Energy: {create_progress_bar(stats['energy'])}\n"
+                f"{STAT_ICONS['hygiene']} Hygiene: {create_progress_bar(stats['hygiene'])}"
+            )
             
             embed.add_field(
                 name="Stats",
-                value='\n'.join(stats_text),
+                value=stats_text,
                 inline=False
             )
             
@@ -261,86 +379,188 @@ class PetView(View):
             return embed
             
         except Exception as e:
-            logger.error(f"Error creating status embed: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error creating status embed: {e}")
             raise
+    def _render_key(self, now: datetime) -> tuple:
+        """Returns the values shown in the status embed, used to skip no-op edits."""
+        pet_state = self.pet_state
+        return (
+            pet_state.name,
+            pet_state.species,
+            pet_state.state,
+            self.last_action,
+            tuple(pet_state.stats.values()),
+            format_cooldown((now - pet_state.last_update).total_seconds())
+        )
     async def update_display(self, interaction: Optional[discord.Interaction] = None):
         """Updates the pet display."""
-        async with self._lock:
-            try:
-                # Update pet state
-                await self.pet_state.update()
+        # Periodic refresh with nothing to edit (message gone or not sent yet)
+        if interaction is None and self.message is None:
+            return
+            
+        self._generation += 1
+        generation = self._generation
+        try:
+            # Update pet state
+            await self.pet_state.update()
+            self.setup_buttons()
+            
+            # Periodic refreshes skip the render and edit when nothing visible changed;
+            # interaction-driven ones still edit but reuse the last embed
+            now = datetime.now(timezone.utc)
+            render_key = self._render_key(now)
+            if render_key == self._render_cache_key and self._embed is not None:
+                if interaction is None:
+                    return
+                embed = self._embed
+            else:
+                embed = await self.create_status_embed(now)
                 
-                # Create new embed
-                embed = await self.create_status_embed()
+            # A newer call started while this one was rendering; let it send
+            if generation != self._generation:
+                return
+            self._embed = embed
+            self._render_cache_key = render_key
+            
+            # Update message
+            if interaction:
+                await self.send_latest(interaction.edit_original_response)
+            elif self.message:
+                edit_scheduler.submit(self.message, self)
                 
-                # Update message
-                if interaction:
-                    await interaction.edit_original_response(
-                        embed=embed,
-                        view=self
-                    )
-                elif self.message:
-                    await self.message.edit(
-                        embed=embed,
-                        view=self
-                    )
+        except Exception as e:
+            logger.exception(f"Error updating display: {e}")
+            
+            if interaction:
+                await interaction.followup.send(
+                    "❌ Failed to update display!",
+                    ephemeral=True
+                )
+            elif self.message and self._embed is not None:
+                try:
+                    await self.send_latest(self.message.edit)
+                except (discord.NotFound, discord.Forbidden):
+                    self.detach()
+                except Exception as e:
+                    logger.exception(f"Error in fallback message edit: {e}")
                     
-            except Exception as e:
-                logger.error(f"Error updating display: {e}")
-                logger.error(traceback.format_exc())
-                
-                if interaction:
-                    await interaction.followup.send(
-                        "❌ Failed to update display!",
-                        ephemeral=True
-                    )
-                elif self.message:
-                    try:
-                        await self.message.edit(embed=embed, view=self)
-                    except Exception as e:
-                        logger.error(f"Error in fallback message edit: {e}")
-                        logger.error(traceback.format_exc())
-                        
-    def start_update_loop(self):
-        """Starts the automatic update loop."""
-        self.update_loop.start()
-
-    def stop_update_loop(self):
-        """Stops the automatic update loop."""
-        self.update_loop.cancel()
+    async def send_latest(self, edit) -> None:
+        """
+        Sends the newest embed through an edit call, one edit at a time.
+        
+        Interaction edits and scheduled edits can be in flight together; holding the
+        lock and reading the embed only once it's held means the last edit to land
+        always carries the newest render.
+        
+        Args:
+            edit: message.edit or interaction.edit_original_response
+        """
+        async with self._send_lock:
+            await edit(embed=self._embed, view=self)
+                    
+    def schedule_display_update(self, interaction: discord.Interaction):
+        """
+        Redraws the display once for a burst of button clicks.
+        
+        Args:
+            interaction: Most recent interaction, used to edit the message
+        """
+        self._pending_interaction = interaction
+        if self._debounce_task is None or self._debounce_task.done():
+            self._debounce_task = asyncio.get_running_loop().create_task(
+                self._debounced_update()
+            )
 
-    @tasks.loop(seconds=15)
-    async def update_loop(self):
-        """Periodically updates the display."""
-        await self.update_display()
+    async def _debounced_update(self):
+        """Waits out CLICK_DEBOUNCE, then renders every change made in the meantime."""
+        # Clicks landing while a redraw is in flight are picked up by the next pass;
+        # schedule_display_update won't start another task while this one runs
+        while self._pending_interaction is not None:
+            await asyncio.sleep(self.CLICK_DEBOUNCE)
+            interaction, self._pending_interaction = self._pending_interaction, None
+            await self.update_display(interaction)
 
-    @update_loop.error
-    async def update_error(self, error: Exception):
+    def _refresh_due(self, now: float) -> bool:
         """
-        Handles errors in the update loop.
+        Checks whether the periodic refresh should redraw this view.
         
         Args:
-            error: Exception that occurred
+            now: time.monotonic() reading
+        """
+        # Awake pets are redrawn every cycle
+        if self.pet_state.state != PetStatus.SLEEPING:
+            return True
+        # Slack so a cycle running slightly early doesn't skip a whole extra cycle
+        return now - self._last_refresh >= self.SLEEPING_REFRESH_INTERVAL * 0.9
+
+    def register(self):
+        """Adds this view to the shared refresh loop, starting the loop if needed."""
+        PetView._active_views.add(self)
+        task = PetView._refresh_task
+        if task is None or task.done():
+            PetView._refresh_task = asyncio.get_running_loop().create_task(
+                PetView._refresh_loop()
+            )
+
+    def unregister(self):
+        """Removes this view from the shared refresh loop."""
+        PetView._active_views.discard(self)
+
+    def detach(self):
+        """Stops refreshing a view whose message was deleted or can no longer be edited."""
+        self.unregister()
+        self.message = None
+
+    @staticmethod
+    async def _refresh_loop():
         """
-        logger.error(f"Error in update loop: {error}")
-        logger.error(traceback.format_exc())
+        Periodically updates the display of every registered view until none remain.
         
-        # Try to restart the loop
-        self.update_loop.restart()
+        Views are refreshed in batches spread evenly over REFRESH_INTERVAL so message
+        edits go out at a steady rate instead of one burst per interval.
+        """
+        # Sleep to fixed deadlines, carried across cycles, so slow edits don't
+        # stretch the period; only resync when the schedule has fallen behind
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while PetView._active_views:
+            views = list(PetView._active_views)
+            size = PetView.REFRESH_BATCH_SIZE
+            batches = [views[i:i + size] for i in range(0, len(views), size)]
+            pause = PetView.REFRESH_INTERVAL / len(batches)
+            
+            for batch in batches:
+                deadline += pause
+                delay = deadline - loop.time()
+                if delay < 0:
+                    # Edits overran the slot; start over from now instead of bursting
+                    deadline = loop.time()
+                    delay = 0.0
+                await asyncio.sleep(delay)
+                # Skip views unregistered since the cycle started or not yet due
+                now = time.monotonic()
+                batch = [
+                    view for view in batch
+                    if view in PetView._active_views and view._refresh_due(now)
+                ]
+                for view in batch:
+                    view._last_refresh = now
+                try:
+                    results = await asyncio.gather(
+                        *(view.update_display() for view in batch),
+                        return_exceptions=True
+                    )
+                    for view, result in zip(batch, results):
+                        if isinstance(result, Exception):
+                            logger.error(f"Error in update loop for pet {view.pet_state.pet_id}: {result}")
+                except Exception as e:
+                    logger.exception(f"Error in update loop: {e}")
 
     async def on_timeout(self):
         """Handles view timeout."""
-        self.stop_update_loop()
+        self.unregister()
         if self.message:
             try:
                 await self.message.edit(view=None)
             except Exception as e:
                 logger.error(f"Error removing view on timeout: {e}")
-
-    def __del__(self):
-        """Cleanup on deletion."""
-        try:
-            self.stop_update_loop()
-        except Exception as e:
-            logger.error(f"Error during view cleanup: {e}")
\ No newline at end of file
@@ -1,16 +1,113 @@
 # message_handlers.py
+import asyncio
 import datetime
 from datetime import timezone
+import time
 import traceback
+from collections import Counter
 from typing import Dict, List, Tuple
 import nextcord
 
 # Local imports
 from database.database import get_game_session_by_guild_id, create_game_session, get_game_session_by_id, get_all_game_channels, execute_query, game_sessions_dict, update_local_game_sessions, insert_first_click
-from utils.utils import config, logger, lock, format_time, get_color_emoji, get_color_state
+from utils.utils import config, logger, format_time, get_color_emoji, get_color_state, COLOR_EMOJIS
 from text.full_text import LORE_TEXT
 from button.button_functions import setup_roles, create_button_message, paused_games
 
+# Channels the bot listens in, built once instead of on every message
+ALLOWED_CHANNEL_IDS = frozenset({
+    1236468062107209758, 1236468247856156722, # Moon's Server
+    1305588554210087105, 1305588592147693649, 
+    1305622604261883955, 1305683310525288448, 
+    1308486315502997574, 1308488586215292988, # Goon Squad
+    1310445586394382357, 1310445611652223047, # Lilith's Den
+    1311011995868336209, 1311012042907586601, # BlackRoseThorns
+    1315352789034995782, 1315353475328245874 # Midnight Vibes
+})
+
+# First word of each command -> (command name, whether it takes arguments).
+# Commands without arguments only match when the message is exactly that word.
+COMMANDS = {
+    'startbutton': ('startbutton', False),
+    'sb': ('startbutton', False),
+    'insert_first_click': ('insert_first_click', False),
+    'myrank': ('rank', True),
+    'rank': ('rank', True),
+    'urrank': ('rank', True),
+    'showclicks': ('showclicks', False),
+    'leaderboard': ('leaderboard', True),
+    'clicklist': ('clicklist', True),
+    'help': ('help', False),
+    'check': ('check', False),
+    'force_update_button': ('force_update_button', False),
+    'ended': ('ended', False),
+    'lore': ('lore', False),
+    'add_new_game': ('add_new_game', False)
+}
+
+SHOWCLICKS_MAX = 500  # Clicks drawn in the showclicks embed (50 rows of 10)
+
+# Characters of a message inspected for its command word; longer than any command
+COMMAND_WORD_SCAN = 32
+
+SESSION_CACHE_TTL = 30  # Seconds a guild's game session is reused before re-reading it
+_session_cache: Dict[int, Tuple[float, dict]] = {}  # guild_id -> (monotonic fetch time, game session)
+
+async def cached_get_game_session(guild_id, ttl=SESSION_CACHE_TTL):
+    """
+    Get a guild's game session, reusing a recent lookup instead of querying every command.
+    
+    Args:
+        guild_id (int): Guild to look up
+        ttl (float): Seconds a cached session stays valid
+    
+    Returns:
+        dict: The game session, or None if the guild has none
+    """
+    now = time.monotonic()
+    cached = _session_cache.get(guild_id)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    
+    game_session = await asyncio.to_thread(get_game_session_by_guild_id, guild_id)
+    # Misses aren't cached so a newly started game is picked up right away
+    if game_session:
+        _session_cache[guild_id] = (now, game_session)
+    return game_session
+
+def invalidate_game_session(guild_id):
+    """Drop a guild's cached game session so the next lookup reads it fresh."""
+    _session_cache.pop(guild_id, None)
+
+# Fire-and-forget tasks, referenced here so they aren't garbage collected mid-run
+_background_tasks = set()
+
+# Await a best-effort Discord call (deleting a message, removing a reaction),
+# ignoring API errors such as the message already being gone or missing permissions.
+# Unlike a bare except, this lets cancellation and real bugs propagate.
+async def ignore_discord_errors(coro):
+    try:
+        return await coro
+    except (nextcord.NotFound, nextcord.Forbidden, nextcord.HTTPException):
+        return None
+
+# Delete the bot's own recent start commands from the channel
+async def cleanup_start_commands(channel, bot):
+    try:
+        stale = [
+            m async for m in channel.history(limit=5)
+            if m.author == bot.user and (m.content.lower() == "sb" or m.content.lower() == "startbutton")
+        ]
+        if not stale: return
+        
+        # One bulk delete request; needs Manage Messages, so fall back to deleting one by one
+        try: await channel.delete_messages(stale)
+        except (nextcord.Forbidden, nextcord.HTTPException):
+            for m in stale:
+                await ignore_discord_errors(m.delete())
+    except Exception as e:
+        tb = traceback.format_exc()
+        logger.error(f'Error cleaning up start commands: {e}, {tb}')
 
 # Handle message function
 # This function is responsible for handling messages in the game channels.
@@ -20,17 +117,26 @@ from button.button_functions import setup_roles, create_button_message, paused_g
 # - leaderboard: scores, scoreboard, top **Check the top 10 clickers**
 # - check **Check if you have a click ready**
 async def handle_message(message, bot, menu_timer):
-    global paused_games, lock, logger
-    if message.author == bot.user and message.content.lower() != "sb": return
-    if not isinstance(message.channel, nextcord.DMChannel) and message.channel.id not in [
-        1236468062107209758, 1236468247856156722, # Moon's Server
-        1305588554210087105, 1305588592147693649, 
-        1305622604261883955, 1305683310525288448, 
-        1308486315502997574, 1308488586215292988, # Goon Squad
-        1310445586394382357, 1310445611652223047, # Lilith's Den
-        1311011995868336209, 1311012042907586601, # BlackRoseThorns
-        1315352789034995782, 1315353475328245874 # Midnight Vibes
-        ]: return #get_all_game_channels() and message.content.lower() != 'sb': return
+    global paused_games, logger
+    # Most messages are chat, not commands: check the first word (command words are
+    # short, so only a prefix of the content is looked at) before any other work
+    first_word = message.content[:COMMAND_WORD_SCAN].split(None, 1)
+    if not first_word or first_word[0].lower() not in COMMANDS: return
+    
+    # Lowercased once; every command below matches against these
+    content_lower = message.content.lower()
+    if message.author == bot.user and content_lower != "sb": return
+    if not isinstance(message.channel, nextcord.DMChannel) and message.channel.id not in ALLOWED_CHANNEL_IDS: return #get_all_game_channels() and message.content.lower() != 'sb': return
+    content_parts = content_lower.split()
+    
+    # Resolve the command with one dict lookup on the first word. The prefix check
+    # above can disagree with the full split (leading whitespace pushing the word
+    # past the prefix), so this lookup decides.
+    command_entry = COMMANDS.get(content_parts[0])
+    if command_entry is None: return
+    command = None
+    if command_entry[1] or len(content_parts) == 1:
+        command = command_entry[0]
     
     try:
         logger.info(f"Message received in {message.guild.name}: {message.content}")
@@ -38,27 +144,28 @@ async def handle_message(message, bot, menu_timer):
         logger.info(f"Message received in DM: {message.content}")
     try:
         
-        if message.content.lower() == 'startbutton' or message.content.lower() == 'sb':
+        if command == 'startbutton':
             logger.info(f"Starting button game in {message.guild.name}")
             # Check if the user has admin permissions or is the bot
             if (message.author.guild_permissions.administrator or message.author.id == 692926265405079632) or message.author == bot.user:
                 #await message.channel.purge(limit=10, check=lambda m: m.author == bot.user)
                 
-                async for m in message.channel.history(limit=5):
-                    if m.author == bot.user and (m.content.lower() == "sb" or m.content.lower() == "startbutton"):
-                        try: await m.delete()
-                        except: pass
+                # Clean up in the background so starting the game doesn't wait on it
+                cleanup_task = asyncio.create_task(cleanup_start_commands(message.channel, bot))
+                _background_tasks.add(cleanup_task)
+                cleanup_task.add_done_callback(_background_tasks.discard)
                         
-                game_session = get_game_session_by_guild_id(message.guild.id)
+                game_session = await cached_get_game_session(message.guild.id)
                 if game_session:
                     await create_button_message(game_session['game_id'], bot)
                     logger.info(f"Button game already started in {message.guild.name}")
                 else:
                     logger.info(f"Starting button game in {message.guild.name}")
                     start_time = datetime.datetime.now(timezone.utc)
-                    timer_duration = message.content.split(" ")[1] if len(message.content.split(" ")) > 2 else config['timer_duration']
-                    cooldown_duration = message.content.split(" ")[2] if len(message.content.split(" ")) > 2 else config['cooldown_duration']
-                    chat_channel_id = message.content.split(" ")[3] if len(message.content.split(" ")) > 3 else message.channel.id
+                    # startbutton only matches the bare word, so the game always starts with the configured timings
+                    timer_duration = config['timer_duration']
+                    cooldown_duration = config['cooldown_duration']
+                    chat_channel_id = message.channel.id
                     
                     admin_role_id = 0
                     try:
@@ -71,16 +178,17 @@ async def handle_message(message, bot, menu_timer):
                         logger.error(f'Error adding role: {e}, {tb}')
                         logger.info('Skipping role addition...')
                     
-                    game_id = create_game_session(admin_role_id, message.guild.id, message.channel.id, chat_channel_id, start_time, timer_duration, cooldown_duration)
+                    game_id = await asyncio.to_thread(create_game_session, admin_role_id, message.guild.id, message.channel.id, chat_channel_id, start_time, timer_duration, cooldown_duration)
+                    invalidate_game_session(message.guild.id)
                     
-                    game_session = get_game_session_by_id(game_id)
+                    game_session = await asyncio.to_thread(get_game_session_by_id, game_id)
                     game_sessions_as_dict = game_sessions_dict()
                     if game_sessions_as_dict:
                         game_sessions_as_dict[game_id] = game_session
                     else:
                         game_sessions_as_dict = {game_id: game_session}
 
-                    update_local_game_sessions()
+                    await asyncio.to_thread(update_local_game_sessions)
                     
                     if game_id in paused_games: 
                         try:
@@ -92,7 +200,7 @@ async def handle_message(message, bot, menu_timer):
                             pass
                     
                     await setup_roles(message.guild.id, bot)
-                    update_local_game_sessions()
+                    await asyncio.to_thread(update_local_game_sessions)
                     await create_button_message(game_id, bot)
                 
                 if menu_timer and not menu_timer.update_timer_task.is_running():
@@ -103,16 +211,16 @@ async def handle_message(message, bot, menu_timer):
         
             else: await message.channel.send('You do not have permission to start the button game.')
                 
-            try: await message.delete()
-            except: pass
+            await ignore_discord_errors(message.delete())
 
-        elif message.content.lower() == 'insert_first_click': #insert_first_click from database
+        elif command == 'insert_first_click': #insert_first_click from database
             try:
                 user_id = message.author.id
-                game_session = get_game_session_by_guild_id(message.guild.id)
+                game_session = await cached_get_game_session(message.guild.id)
                 username = message.author.display_name if message.author.display_name else message.author.name
                 now = 43200
-                result = insert_first_click(game_session['game_id'], user_id, username, now)
+                result = await asyncio.to_thread(insert_first_click, game_session['game_id'], user_id, username, now)
+                invalidate_game_session(message.guild.id)
                 if result:
                     logger.info(f'First click inserted for {username}')
                     await message.channel.send(f'First click inserted for {username}')
@@ -122,9 +230,9 @@ async def handle_message(message, bot, menu_timer):
                 tb = traceback.format_exc()
                 logger.error(f'Error inserting first click: {e}, {tb}')
         
-        elif message.content.lower().startswith(('myrank', 'rank', 'urrank')):
+        elif command == 'rank':
             await message.add_reaction('⌛')
-            game_session = get_game_session_by_guild_id(message.guild.id)
+            game_session = await cached_get_game_session(message.guild.id)
             if not game_session:
                 await message.channel.send('No active game session found in this server!')
                 return
@@ -134,7 +242,7 @@ async def handle_message(message, bot, menu_timer):
             is_other_user = False
             
             # Check if this is a urrank command or if additional arguments are provided
-            command_parts = message.content.lower().split()
+            command_parts = content_parts
             if len(command_parts) > 1:
                 # Check for user mention
                 if len(message.mentions) > 0:
@@ -151,36 +259,36 @@ async def handle_message(message, bot, menu_timer):
                         return
 
             try:
-                # Get user's clicks for current game session
+                # Get user's clicks for current game session. Rank and player count come from
+                # one uncorrelated derived table, evaluated once rather than per click row.
                 query = '''
                     SELECT 
                         bc.timer_value,
                         bc.click_time,
-                        (
-                            SELECT COUNT(DISTINCT u2.user_id)
-                            FROM button_clicks bc2 
-                            JOIN users u2 ON bc2.user_id = u2.user_id 
-                            WHERE bc2.game_id = %s 
-                            AND u2.total_clicks > (
-                                SELECT COUNT(*) 
-                                FROM button_clicks bc3 
-                                WHERE bc3.user_id = %s 
-                                AND bc3.game_id = %s
-                            )
-                        ) + 1 AS user_rank,
-                        (
-                            SELECT COUNT(DISTINCT user_id) 
-                            FROM button_clicks 
-                            WHERE game_id = %s
-                        ) AS total_players
+                        standings.user_rank,
+                        standings.total_players
                     FROM button_clicks bc
+                    CROSS JOIN (
+                        SELECT
+                            COUNT(DISTINCT CASE WHEN u2.total_clicks > target.click_count THEN u2.user_id END) + 1 AS user_rank,
+                            COUNT(DISTINCT bc2.user_id) AS total_players
+                        FROM button_clicks bc2
+                        JOIN users u2 ON bc2.user_id = u2.user_id
+                        CROSS JOIN (
+                            SELECT COUNT(*) AS click_count
+                            FROM button_clicks
+                            WHERE user_id = %s
+                            AND game_id = %s
+                        ) AS target
+                        WHERE bc2.game_id = %s
+                    ) AS standings
                     WHERE bc.game_id = %s 
                     AND bc.user_id = %s
                     ORDER BY bc.click_time
                 '''
-                params = (game_session['game_id'], target_user_id, game_session['game_id'], 
-                         game_session['game_id'], game_session['game_id'], target_user_id)
-                success = execute_query(query, params)
+                params = (target_user_id, game_session['game_id'], game_session['game_id'],
+                         game_session['game_id'], target_user_id)
+                success = await asyncio.to_thread(execute_query, query, params)
                 if not success: 
                     logger.error('Error retrieving user rank data')
                     await message.channel.send('An error occurred while retrieving rank data!')
@@ -190,15 +298,6 @@ async def handle_message(message, bot, menu_timer):
 
                 clicks = success
 
-                def Counter(emojis):
-                    counts = {}
-                    for emoji in emojis:
-                        if emoji in counts:
-                            counts[emoji] += 1
-                        else:
-                            counts[emoji] = 1
-                    return counts
-
                 if clicks:
                     color_emojis = [get_color_emoji(timer_value, game_session['timer_duration']) for timer_value, _, _, _ in clicks]
                     color_counts = Counter(color_emojis)
@@ -213,7 +312,8 @@ async def handle_message(message, bot, menu_timer):
                         embed = nextcord.Embed(title='Your Heroic Journey')
                         embed.add_field(name='🎑☘ Adventurer', value=user_name, inline=False)
                     else:
-                        target_user = await bot.fetch_user(target_user_id)
+                        # Cached user first; only fall back to an API request if it isn't cached
+                        target_user = bot.get_user(target_user_id) or await bot.fetch_user(target_user_id)
                         if target_user is None:
                             await message.channel.send('Unable to find that user!')
                             await message.remove_reaction('⌛', bot.user)
@@ -249,15 +349,12 @@ async def handle_message(message, bot, menu_timer):
                 msg += ' rank. The button spirits are displeased!'
                 await message.channel.send(msg)
             finally:
-                try:
-                    await message.remove_reaction('⌛', bot.user)
-                except:
-                    pass
+                await ignore_discord_errors(message.remove_reaction('⌛', bot.user))
 
-        elif message.content.lower() == 'showclicks':
+        elif command == 'showclicks':
             await message.add_reaction('🔄')
             try:
-                game_session = get_game_session_by_guild_id(message.guild.id)
+                game_session = await cached_get_game_session(message.guild.id)
                 if not game_session:
                     await message.channel.send('No active game session found in this server!')
                     return
@@ -270,7 +367,7 @@ async def handle_message(message, bot, menu_timer):
                     ORDER BY click_time ASC
                 '''
                 params = (game_session['game_id'],)
-                success = execute_query(query, params)
+                success = await asyncio.to_thread(execute_query, query, params)
                 
                 if not success:
                     logger.error('Failed to retrieve click data')
@@ -284,36 +381,29 @@ async def handle_message(message, bot, menu_timer):
                     await message.remove_reaction('🔄', bot.user)
                     return
 
-                # Convert timer values to emojis
-                click_emojis = [get_color_emoji(click[0], game_session['timer_duration']) for click in clicks]
-                
-                # Count occurrences of each emoji
-                emoji_counts = {
-                    '🟣': click_emojis.count('🟣'),  # Purple
-                    '🔵': click_emojis.count('🔵'),  # Blue
-                    '🟢': click_emojis.count('🟢'),  # Green
-                    '🟡': click_emojis.count('🟡'),  # Yellow
-                    '🟠': click_emojis.count('🟠'),  # Orange
-                    '🔴': click_emojis.count('🔴')   # Red
-                }
+                # Convert timer values to emojis, counting each color (purple to red) in
+                # the same pass. Every click is counted, but only the first
+                # SHOWCLICKS_MAX are kept for display so the embed fits the first time.
+                timer_duration = game_session['timer_duration']
+                emoji_counts = dict.fromkeys(reversed(COLOR_EMOJIS), 0)
+                shown = []
+                for index, click in enumerate(clicks):
+                    emoji = get_color_emoji(click[0], timer_duration)
+                    emoji_counts[emoji] += 1
+                    if index < SHOWCLICKS_MAX:
+                        shown.append(emoji)
 
                 # Create rows of 10 emojis
-                rows = []
-                current_row = []
-                for emoji in click_emojis:
-                    current_row.append(emoji)
-                    if len(current_row) == 10:
-                        rows.append(''.join(current_row))
-                        current_row = []
-                
-                # Add any remaining emojis
-                if current_row:
-                    rows.append(''.join(current_row))
+                rows = [''.join(shown[i:i + 10]) for i in range(0, len(shown), 10)]
+
+                description = '\n'.join(rows)
+                if len(clicks) > SHOWCLICKS_MAX:
+                    description += '\n... [Additional clicks truncated]'
 
                 # Create the embed
                 embed = nextcord.Embed(
                     title=f'All Clicks From Game #{game_session["game_id"]}',
-                    description='\n'.join(rows)
+                    description=description
                 )
 
                 # Add color summary
@@ -321,7 +411,7 @@ async def handle_message(message, bot, menu_timer):
                 embed.add_field(name='Color Summary', value=summary, inline=False)
 
                 # Add total clicks
-                embed.add_field(name='Total Clicks', value=str(len(click_emojis)), inline=False)
+                embed.add_field(name='Total Clicks', value=str(len(clicks)), inline=False)
 
                 try:
                     await message.channel.send(embed=embed)
@@ -342,147 +432,80 @@ async def handle_message(message, bot, menu_timer):
             finally:
                 await message.remove_reaction('🔄', bot.user)
 
-        elif 'leaderboard' in message.content.lower() and len(message.content.split()) <= 2 and message.content.split()[0].lower() == 'leaderboard':
+        elif command == 'leaderboard' and len(content_parts) <= 2:
             await message.add_reaction('⏳')
-            game_session = get_game_session_by_guild_id(message.guild.id)
+            game_session = await cached_get_game_session(message.guild.id)
             if not game_session:
                 await message.channel.send('No active game session found in this server!')
                 return
 
             num_entries = 5
-            if len(message.content.split()) > 1:
+            if len(content_parts) > 1:
                 try:
-                    num_entries = int(message.content.split(" ")[1])
+                    num_entries = int(content_parts[1])
                 except ValueError:
                     pass
 
             try:
-                # Most clicks in current game session
-                # Update the leaderboard query
+                # Fetch the game's clicks once and build all three leaderboards from them
                 query = '''
-                    SELECT 
-                        u.user_name,
-                        COUNT(*) AS total_clicks,
-                        GROUP_CONCAT(
-                            CASE
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 83.33 THEN '🟣'
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 66.67 THEN '🔵'
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 50.00 THEN '🟢'
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 33.33 THEN '🟡'
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 16.67 THEN '🟠'
-                                ELSE '🔴'
-                            END
-                            ORDER BY bc.timer_value
-                            SEPARATOR ''
-                        ) AS color_sequence,
-                        SUM(
-                            POWER(2, 5 - FLOOR((bc.timer_value / %s) * 100 / 16.66667)) * 
-                            (1 + 
-                                CASE 
-                                    WHEN (bc.timer_value / %s) * 100 < 33.33 
-                                    THEN 1 - ((bc.timer_value / %s) * 100 % 16.66667) / 16.66667
-                                    ELSE 1 - ABS(0.5 - ((bc.timer_value / %s) * 100 % 16.66667) / 16.66667)
-                                END
-                            ) * (%s / 43200)
-                        ) AS mmr_score
-                    FROM button_clicks bc
-                    JOIN users u ON bc.user_id = u.user_id
-                    WHERE bc.game_id = %s
-                    GROUP BY u.user_id
-                    ORDER BY mmr_score DESC, total_clicks DESC
-                    LIMIT %s
-                '''
-                params = (
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['game_id'],
-                    num_entries
-                )
-                success = execute_query(query, params)
-                most_clicks = success
-
-                # Lowest individual clicks in current game session
-                query = '''
-                    SELECT u.user_name, bc.timer_value
+                    SELECT bc.user_id, u.user_name, bc.timer_value
                     FROM button_clicks bc
                     JOIN users u ON bc.user_id = u.user_id
                     WHERE bc.game_id = %s
                     ORDER BY bc.timer_value
-                    LIMIT %s
                 '''
-                success = execute_query(query, (game_session['game_id'], num_entries))
-                lowest_individual_clicks = success
-
-                # Lowest user clicks in current game session
-                # Update the Lowest individual clicks query
-                query = '''
-                    SELECT 
-                        u.user_name, 
-                        bc.timer_value,
-                        CASE
-                            WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 83.33 THEN '🟣'
-                            WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 66.67 THEN '🔵'
-                            WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 50.00 THEN '🟢'
-                            WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 33.33 THEN '🟡'
-                            WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 16.67 THEN '🟠'
-                            ELSE '🔴'
-                        END as color_emoji
-                    FROM button_clicks bc
-                    JOIN users u ON bc.user_id = u.user_id
-                    WHERE bc.game_id = %s
-                    ORDER BY bc.timer_value
-                    LIMIT %s
-                '''
-                params = (
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['timer_duration'],
-                    game_session['game_id'],
-                    num_entries
-                )
-                success = execute_query(query, params)
-                lowest_individual_clicks = success
+                success = await asyncio.to_thread(execute_query, query, (game_session['game_id'],))
+                clicks = success or []
+                timer_duration = game_session['timer_duration']
+
+                # user_id -> [user_name, total_clicks, color emojis, mmr_score, total_time_claimed]
+                user_totals = {}
+                click_colors = []
+                for user_id, user_name, timer_value in clicks:
+                    color_emoji = get_color_emoji(timer_value, timer_duration)
+                    click_colors.append(color_emoji)
+                    totals = user_totals.get(user_id)
+                    if totals is None:
+                        totals = user_totals[user_id] = [user_name, 0, [], 0.0, 0]
+                    totals[1] += 1
+                    totals[2].append(color_emoji)
+                    totals[3] += calculate_mmr(timer_value, timer_duration)
+                    if timer_value <= timer_duration:  # Safety check for any invalid timer values
+                        totals[4] += timer_duration - timer_value
+
+                # Most clicks in current game session, ranked by MMR
+                most_clicks = [
+                    (user_name, total_clicks, ''.join(colors), mmr_score)
+                    for user_name, total_clicks, colors, mmr_score, _ in sorted(
+                        user_totals.values(), key=lambda totals: (totals[3], totals[1]), reverse=True
+                    )[:num_entries]
+                ]
+
+                # Lowest individual clicks in current game session (clicks are already sorted)
+                lowest_individual_clicks = [
+                    (user_name, timer_value, color_emoji)
+                    for (_, user_name, timer_value), color_emoji in zip(clicks[:num_entries], click_colors)
+                ]
 
                 # Most time claimed in current game session
-                query = '''
-                    SELECT
-                        u.user_name,
-                        SUM(
-                            CASE 
-                                WHEN bc.timer_value <= %s THEN %s - bc.timer_value
-                                ELSE 0  -- Safety check for any invalid timer values
-                            END
-                        ) AS total_time_claimed
-                    FROM button_clicks bc
-                    JOIN users u ON bc.user_id = u.user_id
-                    WHERE bc.game_id = %s
-                    GROUP BY u.user_id
-                    ORDER BY total_time_claimed DESC
-                    LIMIT %s
-                '''
-                params = (
-                    game_session['timer_duration'],  # For the <= check
-                    game_session['timer_duration'],  # For the subtraction
-                    game_session['game_id'],
-                    num_entries
-                )
-                success = execute_query(query, params)
-                most_time_claimed = success
+                most_time_claimed = [
+                    (totals[0], totals[4])
+                    for totals in sorted(user_totals.values(), key=lambda totals: totals[4], reverse=True)[:num_entries]
+                ]
                 embed = nextcord.Embed(
                     title='🏆 The Leaderboard Legends of the Button 🏆')
 
-                # Helper function to get display name
+                # Helper function to get display name, memoized since a user often
+                # appears on several boards and get_member_named scans the member list
+                display_names = {}
                 def get_display_name(username):
+                    display_name = display_names.get(username)
+                    if display_name is None:
+                        display_name = display_names[username] = lookup_display_name(username)
+                    return display_name
+
+                def lookup_display_name(username):
                     try:
                         # First try to get member object
                         member = message.guild.get_member_named(username)
@@ -555,11 +578,11 @@ async def handle_message(message, bot, menu_timer):
             finally:
                 await message.remove_reaction('⏳', bot.user)
 
-        elif message.content.lower().startswith('clicklist'):
+        elif command == 'clicklist':
             await message.add_reaction('⌛')
             try:
                 # Parse command arguments
-                args = message.content.lower().split()
+                args = content_parts
                 limit = 25  # Default limit
                 is_global = False
                 
@@ -570,7 +593,7 @@ async def handle_message(message, bot, menu_timer):
                     elif arg == 'global':
                         is_global = True
 
-                game_session = get_game_session_by_guild_id(message.guild.id)
+                game_session = await cached_get_game_session(message.guild.id)
                 if not game_session and not is_global:
                     await message.channel.send('No active game session found in this server!')
                     return
@@ -608,7 +631,7 @@ async def handle_message(message, bot, menu_timer):
                     '''
                     params = (game_session['game_id'], limit)
 
-                results = execute_query(query, params)
+                results = await asyncio.to_thread(execute_query, query, params)
                 
                 if not results:
                     await message.channel.send('No clicks found!')
@@ -622,6 +645,7 @@ async def handle_message(message, bot, menu_timer):
                 # Process results in chunks to respect Discord's field length limits
                 current_field = ""
                 field_count = 1
+                guild_names = {}  # guild_id -> display name; results repeat the same few guilds
                 
                 for timer_value, click_time, user_name, guild_id, game_session_id in results:
                     # Get color emoji based on timer value
@@ -632,8 +656,11 @@ async def handle_message(message, bot, menu_timer):
                     entry += f"<t:{int(click_time.timestamp())}:R>\n"
                     
                     if is_global:
-                        guild = bot.get_guild(guild_id)
-                        guild_name = guild.name if guild else f"Unknown Server ({guild_id})"
+                        guild_name = guild_names.get(guild_id)
+                        if guild_name is None:
+                            guild = bot.get_guild(guild_id)
+                            guild_name = guild.name if guild else f"Unknown Server ({guild_id})"
+                            guild_names[guild_id] = guild_name
                         entry += f"Server: {guild_name}\n"
                     
                     entry += "\n"  # Add spacing between entries
@@ -667,7 +694,7 @@ async def handle_message(message, bot, menu_timer):
             finally:
                 await message.remove_reaction('⌛', bot.user)
 
-        elif message.content.lower() == 'help':
+        elif command == 'help':
             embed = nextcord.Embed(title='Help', description='Available Commands')
             embed.add_field(name='myrank', value='Check your personal stats', inline=False)
             embed.add_field(name='leaderboard', value='Check the top 10 clickers', inline=False)
@@ -680,12 +707,12 @@ async def handle_message(message, bot, menu_timer):
             embed.color = nextcord.Color.from_rgb(*color)
             await message.channel.send(embed=embed)
 
-        elif message.content.lower() == 'check':
+        elif command == 'check':
             await message.add_reaction('⏳')
             user_check_id = message.author.id
             try:
                 # Get the game session to access the cooldown duration
-                game_session = get_game_session_by_guild_id(message.guild.id)
+                game_session = await cached_get_game_session(message.guild.id)
                 if not game_session:
                     await message.channel.send('No active game session found in this server!')
                     await message.remove_reaction('‚è≥', bot.user)
@@ -700,7 +727,7 @@ async def handle_message(message, bot, menu_timer):
                     AND click_time >= DATE_SUB(UTC_TIMESTAMP(), INTERVAL %s HOUR)
                 '''
                 params = (user_check_id, cooldown_duration)
-                success = execute_query(query, params)
+                success = await asyncio.to_thread(execute_query, query, params)
                 if not success:
                     logger.error('Failed to retrieve data.')
                     await message.add_reaction('‚ùå')
@@ -720,13 +747,13 @@ async def handle_message(message, bot, menu_timer):
             finally:
                 await message.remove_reaction('⏳', bot.user)
 
-        elif message.content.lower() == 'force_update_button':
+        elif command == 'force_update_button':
             if message.author.id != 692926265405079632:
                 if not message.author.guild_permissions.administrator:
                     await message.channel.send('You need administrator permissions to use this command.')
                     return
             try:
-                game_session = get_game_session_by_guild_id(message.guild.id)
+                game_session = await cached_get_game_session(message.guild.id)
                 if not game_session:
                     await message.channel.send('No active game session found in this server!')
                     return
@@ -742,43 +769,54 @@ async def handle_message(message, bot, menu_timer):
                 else:
                     await message.channel.send('Failed to reset button message. Please try again.')
                 
-                try:
-                    await message.delete()
-                except:
-                    pass
+                await ignore_discord_errors(message.delete())
                     
             except Exception as e:
                 tb = traceback.format_exc()
                 logger.error(f'Error resetting button message: {e}\n{tb}')
                 await message.channel.send('An error occurred while resetting the button message.')
 
-        elif message.content.lower() == 'ended':
+        elif command == 'ended':
             try:
-                query = '''
-                    SELECT 
-                        u.user_name,
-                        COUNT(*) AS total_clicks,
-                        MIN(bc.timer_value) AS lowest_click_time,
-                        GROUP_CONCAT(
-                            CASE
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 83.33 THEN '🟣'
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 66.67 THEN '🔵'
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 50.00 THEN '🟢'
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 33.33 THEN '🟡'
-                                WHEN ROUND((bc.timer_value / %s) * 100, 2) >= 16.67 THEN '🟠'
-                                ELSE '🔴'
-                            END
-                            ORDER BY bc.timer_value
-                            SEPARATOR ''
-                        ) AS color_sequence
+                game_session = await cached_get_game_session(message.guild.id)
+                timer_duration = game_session['timer_duration'] if game_session else config['timer_duration']
+
+                # Scope to the guild's game when there is one
+                game_filter = 'WHERE bc.game_id = %s' if game_session else ''
+                params = (game_session['game_id'],) if game_session else None
+
+                # Per-user totals stay grouped in SQL: one row per user, lowest click first
+                totals_query = f'''
+                    SELECT u.user_id, u.user_name, COUNT(*) AS total_clicks, MIN(bc.timer_value) AS lowest_click_time
                     FROM button_clicks bc
                     JOIN users u ON bc.user_id = u.user_id
-                    GROUP BY u.user_id
+                    {game_filter}
+                    GROUP BY u.user_id, u.user_name
                     ORDER BY lowest_click_time
                 '''
-                params = (game_session['timer_duration'],) * 5  # For each CASE condition
-                success = execute_query(query, params)
-                all_users_data = success
+                # Colors are classified in Python, so only the distinct timer values per
+                # user (with how often each was clicked) come back
+                colors_query = f'''
+                    SELECT bc.user_id, bc.timer_value, COUNT(*)
+                    FROM button_clicks bc
+                    {game_filter}
+                    GROUP BY bc.user_id, bc.timer_value
+                '''
+                totals, timer_counts = await asyncio.gather(
+                    asyncio.to_thread(execute_query, totals_query, params),
+                    asyncio.to_thread(execute_query, colors_query, params)
+                )
+
+                color_counts = {}  # user_id -> Counter of color emojis
+                for user_id, timer_value, count in timer_counts or []:
+                    counts = color_counts.get(user_id)
+                    if counts is None:
+                        counts = color_counts[user_id] = Counter()
+                    counts[get_color_emoji(timer_value, timer_duration)] += count
+                all_users_data = [
+                    (user_name, total_clicks, lowest_click_time, color_counts.get(user_id, Counter()))
+                    for user_id, user_name, total_clicks, lowest_click_time in totals or []
+                ]
                 
                 embed = nextcord.Embed(
                     title='🎉 The Button Game Has Ended! 🎉',
@@ -789,8 +827,8 @@ async def handle_message(message, bot, menu_timer):
                 field_count = 1
                 all_users_value = ""
                 
-                for user, clicks, lowest_time, seq in all_users_data:
-                    user_data = f'{user.replace(".", "")}: {clicks} clicks, Lowest: {format_time(lowest_time)} {" ".join(emoji + "x" + str(seq.count(emoji)) for emoji in ["🟣", "🔵", "🟢", "🟡", "🟠", "🔴"] if emoji in seq)}\n'
+                for user, clicks, lowest_time, counts in all_users_data:
+                    user_data = f'{user.replace(".", "")}: {clicks} clicks, Lowest: {format_time(lowest_time)} {" ".join(emoji + "x" + str(counts[emoji]) for emoji in reversed(COLOR_EMOJIS) if counts[emoji])}\n'
                     
                     if len(all_users_value) + len(user_data) > max_field_length:
                         embed.add_field(name=f'🏅 Adventurers of the Button (Part {field_count}) 🏅', value=all_users_value, inline=False)
@@ -812,7 +850,7 @@ async def handle_message(message, bot, menu_timer):
                 logger.error(f'Error retrieving end game data: {e}, {tb}')
                 await message.channel.send('An error occurred while retrieving the end game data. The button spirits are in turmoil!')
 
-        elif message.content.lower() == 'lore':
+        elif command == 'lore':
             try:
                 embed = nextcord.Embed(title="📜 __The Lore of The Button__ 📜", description=LORE_TEXT)
                 embed.set_footer(text="⚡ *May your clicks be swift and true, adventurer!* ⚡")
@@ -822,10 +860,10 @@ async def handle_message(message, bot, menu_timer):
                 logger.error(f'Error retrieving lore: {e}, {tb}')
                 await message.channel.send('❌ **An error occurred while retrieving the lore.** *The ancient archives seem to be temporarily sealed!* ❌')
 
-        elif message.content.lower() == 'add_new_game':
+        elif command == 'add_new_game':
             try:
                 query = 'SELECT * FROM game_sessions'
-                success = execute_query(query)
+                success = await asyncio.to_thread(execute_query, query)
                 game_sessions = success
                 if game_sessions:
                     for game_session in game_sessions:
@@ -838,7 +876,8 @@ async def handle_message(message, bot, menu_timer):
                         admin_role_id = game_session[6]
                         guild_id = game_session[7]
                         paused_games.append(game_id)
-                        create_game_session(admin_role_id, guild_id, game_channel_id, chat_channel_id, start_time, timer_duration, cooldown_duration)
+                        await asyncio.to_thread(create_game_session, admin_role_id, guild_id, game_channel_id, chat_channel_id, start_time, timer_duration, cooldown_duration)
+                        invalidate_game_session(guild_id)
                         logger.info(f'Game session {game_id} added to paused games.')
                     await message.channel.send('Game sessions added to paused games.')
                 else:
@@ -853,8 +892,8 @@ async def handle_message(message, bot, menu_timer):
         logger.error(f'Error processing message: {e}, {tb}')
 
 async def start_boot_game(bot, button_guild_id, message_button_channel, menu_timer):
-    global paused_games, lock, logger
-    game_session = get_game_session_by_guild_id(button_guild_id)
+    global paused_games, logger
+    game_session = await asyncio.to_thread(get_game_session_by_guild_id, button_guild_id)
     guild = bot.get_guild(button_guild_id)
     if game_session:
         await create_button_message(game_session['game_id'], bot)
@@ -877,16 +916,17 @@ async def start_boot_game(bot, button_guild_id, message_button_channel, menu_tim
             logger.info('Skipping role addition...')
             pass
             
-        game_id = create_game_session(admin_role_id, guild.id, message_button_channel, chat_channel_id, start_time, timer_duration, cooldown_duration)
+        game_id = await asyncio.to_thread(create_game_session, admin_role_id, guild.id, message_button_channel, chat_channel_id, start_time, timer_duration, cooldown_duration)
+        invalidate_game_session(guild.id)
         
-        game_session = get_game_session_by_id(game_id)
+        game_session = await asyncio.to_thread(get_game_session_by_id, game_id)
         game_sessions_as_dict = game_sessions_dict()
         if game_sessions_as_dict:
             game_sessions_as_dict[game_id] = game_session
         else:
             game_sessions_as_dict = {game_id: game_session}
 
-        update_local_game_sessions()
+        await asyncio.to_thread(update_local_game_sessions)
         
         if game_id in paused_games: 
             try:
@@ -898,7 +938,7 @@ async def start_boot_game(bot, button_guild_id, message_button_channel, menu_tim
                 pass
         
         await setup_roles(guild.id, bot)
-        update_local_game_sessions()
+        await asyncio.to_thread(update_local_game_sessions)
         await create_button_message(game_id, bot)
         
     if menu_timer and not menu_timer.update_timer_task.is_running():
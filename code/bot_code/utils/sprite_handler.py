@@ -1,6 +1,6 @@
 from PIL import Image, ImageSequence
 from io import BytesIO
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import asyncio
 from pathlib import Path
 import logging
@@ -16,6 +16,10 @@ current_directory = Path(__file__).parent.parent
 sprites_directory = current_directory / ".." / "assets"
 sprites_directory = os.path.join(sprites_directory, "sprites")
 
+# Resolved sprite URLs by (species, state, emotion). The sprite tables are static,
+# so the cache is shared by every handler.
+_sprite_url_cache: Dict[Tuple[str, str, str], Optional[str]] = {}
+
 class SpriteHandler:
     def __init__(self):
         self.sprite_urls = PET_SPRITES
@@ -26,15 +30,25 @@ class SpriteHandler:
                            state: str, 
                            emotion: str = "neutral") -> str:
         """Get the CDN URL for the specified species, state and emotion."""
-        try:
-            species = species.lower()
+        species = species.lower()
+        
+        if hasattr(state, 'name'):
+            state = state.name.lower()
             
-            if hasattr(state, 'value'):
-                state = state.value
-                
-            if hasattr(emotion, 'value'):
-                emotion = emotion.value
+        if hasattr(emotion, 'value'):
+            emotion = emotion.value
+            
+        key = (species, state, emotion)
+        if key in _sprite_url_cache:
+            return _sprite_url_cache[key]
+            
+        url = self._resolve_sprite_url(species, state, emotion)
+        _sprite_url_cache[key] = url
+        return url
 
+    def _resolve_sprite_url(self, species: str, state: str, emotion: str) -> Optional[str]:
+        """Looks up a sprite URL, falling back to the neutral emotion and then the species default."""
+        try:
             # Try to get the specific state/emotion combination
             return self.sprite_urls[species][state][emotion]
         except KeyError:
@@ -62,8 +76,8 @@ class SpriteHandler:
     def _get_sprite_coordinates(self, state: str, emotion: str) -> tuple:
         """Get coordinates for specific sprite state and emotion."""
         # Convert enum to string if needed
-        if hasattr(state, 'value'):
-            state = state.value.lower()
+        if hasattr(state, 'name'):
+            state = state.name.lower()
         else:
             state = state.lower()
             
@@ -4,7 +4,9 @@ import datetime
 import logging
 import json
 import asyncio
+import functools
 import os
+from bisect import bisect_right
 
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
@@ -54,6 +56,11 @@ COLOR_STATES = [
     (106, 76, 147)    # Purple
 ]
 
+# Lower bound (percent of the timer, rounded to 2 places like SQL ROUND) of each
+# color above red, and the emoji for each color in COLOR_STATES order
+COLOR_THRESHOLDS = (16.67, 33.33, 50.00, 66.67, 83.33)
+COLOR_EMOJIS = ('🔴', '🟠', '🟡', '🟢', '🔵', '🟣')
+
 def get_color_state(timer_value, timer_duration=43200):
     """
     Get the color state based on the remaining time, with precise decimal handling.
@@ -79,9 +86,12 @@ def get_color_state(timer_value, timer_duration=43200):
     else:
         return COLOR_STATES[0]  # Red
 
+@functools.lru_cache(maxsize=4096)
 def get_color_emoji(timer_value, timer_duration=43200):
     """
     Get the color emoji based on the remaining time, with precise decimal handling.
+    Cached, since listing a game's clicks classifies many repeated values against
+    the same duration.
     """
     timer_value = max(0, min(float(timer_value), float(timer_duration)))
     timer_duration = max(1, float(timer_duration))
@@ -89,18 +99,8 @@ def get_color_emoji(timer_value, timer_duration=43200):
     # Use ROUND to match SQL precision
     percentage = round((timer_value / timer_duration) * 100, 2)
     
-    if percentage >= 83.33:
-        return '🟣'  # Purple
-    elif percentage >= 66.67:
-        return '🔵'  # Blue
-    elif percentage >= 50.00:
-        return '🟢'  # Green
-    elif percentage >= 33.33:
-        return '🟡'  # Yellow
-    elif percentage >= 16.67:
-        return '🟠'  # Orange
-    else:
-        return '🔴'  # Red
+    # Number of thresholds at or below the percentage is the color index
+    return COLOR_EMOJIS[bisect_right(COLOR_THRESHOLDS, percentage)]
 
 def get_color_name(timer_value, timer_duration=43200):
     """